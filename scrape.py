@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import argparse
+import atexit
 import yaml
 import art
 import requests
@@ -19,14 +20,28 @@ import json
 import pwd
 import grp
 import shutil
+import errno
 import shlex
 import uuid
+import functools
+import threading
+import signal
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import hashlib
+import colorsys
 import feedparser
 import urllib.parse
 from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
+import soupsieve
 from smb.SMBConnection import SMBConnection
+from smb.base import NotConnectedError, SMBTimeout
+from smb.smb_structs import OperationFailure
 from datetime import datetime
+from xml.sax.saxutils import escape as xml_escape
 from loguru import logger
 from tqdm import tqdm
 from termcolor import colored
@@ -35,6 +50,13 @@ from rich.table import Table
 from rich.style import Style
 from rich.text import Text
 
+YTDLP_AVAILABLE = True
+try:
+	from yt_dlp import YoutubeDL
+	from yt_dlp.utils import DownloadError
+except ImportError:
+	YTDLP_AVAILABLE = False  # Only the yt-dlp command-line tool, if anything, is available
+
 SELENIUM_AVAILABLE = True
 try:
 	from selenium import webdriver
@@ -42,25 +64,106 @@ try:
 	from webdriver_manager.chrome import ChromeDriverManager
 	from selenium.webdriver.chrome.service import Service
 	from selenium.webdriver.chrome.options import Options
+	from selenium.webdriver.support.ui import WebDriverWait
+	from selenium.webdriver.support import expected_conditions as EC
+	from selenium.common.exceptions import TimeoutException
 except:
 	SELENIUM_AVAILABLE = False
 
+try:
+	import orjson
+	json_loads = orjson.loads
+except ImportError:
+	json_loads = json.loads
+
+try:
+	from yaml import CSafeLoader as YamlLoader  # libyaml-backed parser when PyYAML was built with it
+except ImportError:
+	from yaml import SafeLoader as YamlLoader
+
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 SITE_DIR = os.path.join(SCRIPT_DIR, 'sites')
 STATE_FILE = os.path.join(SCRIPT_DIR, '.state')
-
-last_vpn_action_time = 0
+STATE_FLUSH_EVERY = 16  # .state appends per fsync'd batch
+STATE_FLUSH_INTERVAL = 2  # max seconds a queued .state append may wait for its fsync
+PAGE_EXPR_RE = re.compile(r'\{page\s*([+-])\s*(\d+)\}')  # Matches {page - 1}, {page + 2}, etc.
+HTTP_PREFIXES = ('http://', 'https://')
+YTDLP_PROGRESS_RE = re.compile(r'\[download\]\s+(\d+\.\d+)% of ~?\s*(\d+\.\d+)(K|M|G)iB')  # yt-dlp CLI output
+YTDLP_DESTINATION_RE = re.compile(r'\[download\] Destination: (.+)')
+URL_PATTERN_TOKEN_RE = re.compile(r'\{([^{}]*)\}|([^{]+)')  # {wildcard} or a static run
+RESOLUTION_RE = re.compile(r'(?<![0-9A-Za-z])(\d{3,4})[xX×](\d{3,4})(?![0-9A-Za-z])')  # 1920x1080 as a standalone token
+WGET_PROGRESS_RE = re.compile(rb'(\d+)%\s+(\d+[KMG]?)')  # bytes: wget output is read undecoded
+WGET_LENGTH_RE = re.compile(rb'Length: (\d+)')
+MIXED_CASE_RE = re.compile(r'[a-z][A-Z]|[A-Z][a-z]')  # e.g. "McFly", left alone by custom_title_case
+M3U8_URI_LINE_RE = re.compile(r'^(?!#)[^\r\n]+', re.MULTILINE)  # Non-comment, non-empty playlist lines
+M3U8_EXTINF_RE = re.compile(r'^#EXTINF:\s*([\d.]+)', re.MULTILINE)  # Per-segment durations in seconds
+SHELL_METACHARS_RE = re.compile(r'[|&;<>()$`*?~\[\]{}!#\n]|^\s*\w+=')  # Shell syntax or a VAR=value prefix: run VPN commands via /bin/sh
+HEIGHT_RE = re.compile(r'(?<![0-9A-Za-z])(\d{3,4})[pP](?![0-9A-Za-z])')  # 1080p, 720P as standalone tokens (index_720p.m3u8)
+HTML_PARSER = 'lxml'  # C parser (already required for RSS via lxml-xml); much faster than html.parser
+USE_COLOR = sys.stdout.isatty()
+SELENIUM_WAIT_TIMEOUT = 5  # max seconds to wait for a Selenium page, iframe, or m3u8 request
+UNIQUE_ID_CHARS = string.ascii_lowercase + string.ascii_uppercase + string.digits
+FFPROBE_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'smutscrape', 'ffprobe.json')
+FFPROBE_CACHE_MAX = 10000  # Most recent entries kept when the cache is written back
+FONT_WIDTH_PROBE = "MMMMMMMM"  # Wide glyphs, so per-character estimates err on the wide side
+DOWNLOAD_CHUNK_SIZE = 1 << 18  # 256 KiB reads when streaming downloads
+DOWNLOAD_WRITE_BUFFER = 1 << 20  # 1 MiB userspace buffer: roughly one write() syscall per MiB
+DEFAULT_CONCURRENCY = 2  # Video workers when config sets no 'concurrency'; more garble the per-download tqdm bars
+DOWNLOAD_TIMEOUT = (30, 120)  # (connect, read) seconds; a stalled stream raises and falls back to curl/wget
+
+last_vpn_action_time = float('-inf')  # time.monotonic() of the last VPN command
+state_file_handle = None  # Owned by the state writer thread once it has started
+state_queue = queue.Queue()
+state_writer_thread = None
+ffprobe_cache = None  # "path|mtime_ns|size" -> get_video_metadata result, persisted across runs
+ffprobe_cache_dirty = False
+ffprobe_cache_lock = threading.Lock()  # Pool workers probe concurrently
+state_lock = threading.Lock()
+vpn_lock = threading.Lock()
+print_lock = threading.Lock()
+stop_event = threading.Event()  # Set on shutdown (Ctrl-C); workers stop between fetch, download and upload
+smb_lock = threading.RLock()  # pysmb connections are not thread-safe
+smb_connections = {}  # (server, username) -> connected SMBConnection, reused for the whole run
+smb_listings = {}  # (server, share, directory) -> set of file names listed once per run
 session = requests.Session()
+session.max_redirects = 10  # requests allows 30; a real download never needs that many hops
+# Pooled, retrying adapter for the plain session only; CloudScrapers keep their own cipher-suite
+# adapter (their TLS fingerprint) and must see Cloudflare's 503 challenge pages rather than retry them
+http_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]))
+session.mount('https://', http_adapter)
+session.mount('http://', http_adapter)
+cloud_scrapers = {}  # netloc -> CloudScraper, so each host keeps its own challenge state
+cloud_scrapers_lock = threading.Lock()
+_SITE_CONFIG_CACHE = {}  # config path -> (mtime, parsed config)
+_SITE_DIR_LISTING = {'mtime': None, 'files': []}  # SITE_DIR mtime -> (filename, path) of its .yaml files
+_SITE_INDEX = {}  # lowercased shortcode/name/domain -> (filename, config)
+_SITE_DOMAIN_INDEX = {}  # lowercased domain -> (filename, config), for URL lookups
 console = Console()
+# Rich markup for the usage tables, filled per row with str.format
+EXAMPLE_CMD_TEMPLATE = "[red]scrape[/red] [magenta]{}[/magenta] [yellow]{}[/yellow] [blue]\"{}\"[/blue]"
+EXAMPLE_EFFECT_TEMPLATE = "{} [blue]\"{}\"[/blue] on [magenta]{}[/magenta]"
+SITE_CODE_TEMPLATE = "[magenta][bold]{}[/bold][/magenta]"
+SITE_NAME_TEMPLATE = "[magenta]{}[/magenta]"
+METADATA_FIELD_SEPARATOR = "[/bold][/green] · [green][bold]"
+AMP_ENCODING_KEYS = frozenset({"&", " & "})  # url_encoding_rules keys that let a query combine terms
 		
 class ProgressFile:
-	"""A file-like wrapper to track progress during SMB upload."""
-	def __init__(self, file_obj, progress_bar):
+	"""A file-like wrapper that advances a tqdm bar as data is read (SMB uploads, streamed downloads)."""
+	def __init__(self, file_obj, progress_bar, abort_event=None):
 		self.file_obj = file_obj
 		self.pbar = progress_bar
+		self.abort_event = abort_event  # When set, the next read raises so a download stops mid-stream
 		self.total_size = os.fstat(file_obj.fileno()).st_size
+		# Bind the methods pysmb calls repeatedly so they bypass the __getattr__ fallback
+		self.seek = file_obj.seek
+		self.tell = file_obj.tell
+		self.fileno = file_obj.fileno
+		self.readable = getattr(file_obj, 'readable', lambda: True)
+		self.mode = getattr(file_obj, 'mode', 'rb')
 	
 	def read(self, size=-1):
+		if self.abort_event is not None and self.abort_event.is_set():
+			raise InterruptedError("Transfer stopped on shutdown")
 		data = self.file_obj.read(size)
 		if data:
 			self.pbar.update(len(data))
@@ -69,35 +172,243 @@ class ProgressFile:
 	def __getattr__(self, name):
 		return getattr(self.file_obj, name)
 
+class RateLimiter:
+	"""Enforce a minimum, slightly jittered interval between calls to acquire().
+	
+	Unlike a fixed sleep after every page, time already spent processing a page
+	counts toward the interval, so only the remaining delta is slept.
+	"""
+	def __init__(self, min_interval, jitter=0.1):
+		self.min_interval = min_interval
+		self.jitter = jitter
+		self.next_allowed = 0.0
+	
+	def acquire(self):
+		now = time.monotonic()
+		if now < self.next_allowed:
+			time.sleep(self.next_allowed - now)
+			now = self.next_allowed
+		self.next_allowed = now + self.min_interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+def get_page_limiter(general_config):
+	"""Return the run-wide limiter that spaces out list page fetches by sleep.between_pages."""
+	if 'page_limiter' not in general_config:
+		general_config['page_limiter'] = RateLimiter(general_config['sleep']['between_pages'])
+	return general_config['page_limiter']
+
+def url_hash(url):
+	"""64-bit blake2b digest of a URL, its compact stand-in inside a UrlHashSet."""
+	return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class UrlHashSet:
+	"""Set of processed URLs stored as 64-bit hashes rather than full URL strings.
+	
+	Long URLs cost ~100 bytes each as str; an int is a fraction of that and hashes
+	faster on lookup. The chance of two URLs colliding is ~2^-64 per pair.
+	"""
+	def __init__(self, urls=()):
+		self.hashes = {url_hash(url) for url in urls}
+	
+	def add(self, url):
+		self.hashes.add(url_hash(url))
+	
+	def __contains__(self, url):
+		return url_hash(url) in self.hashes
+	
+	def __len__(self):
+		return len(self.hashes)
+
 def load_state():
-	"""Load processed video URLs from .state file into a set."""
+	"""Load processed video URLs from .state file into a UrlHashSet."""
+	flush_state()
 	if not os.path.exists(STATE_FILE):
-		return set()
+		return UrlHashSet()
 	try:
 		with open(STATE_FILE, 'r', encoding='utf-8') as f:
-			return set(line.strip() for line in f if line.strip())
+			state_set = UrlHashSet(line.strip() for line in f if line.strip())
 	except Exception as e:
 		logger.error(f"Failed to load state file '{STATE_FILE}': {e}")
-		return set()
+		return UrlHashSet()
+	return state_set
 
 def save_state(url):
-	"""Append a single URL to the end of the .state file."""
+	"""Queue a URL for the background .state writer."""
+	global state_writer_thread
 	try:
-		with open(STATE_FILE, 'a', encoding='utf-8') as f:
-			f.write(f"{url}\n")
+		# List pages process videos on worker threads, so only one of them starts the writer
+		with state_lock:
+			if state_writer_thread is None:
+				state_writer_thread = threading.Thread(target=state_writer, name="state-writer", daemon=True)
+				state_writer_thread.start()
+				atexit.register(close_state)
+		state_queue.put(f"{url}\n")
 		logger.info(f"Appended URL to state: {url}")
 	except Exception as e:
 		logger.error(f"Failed to append to state file '{STATE_FILE}': {e}")
+
+def state_writer():
+	"""Append queued URLs to .state, fsyncing once per STATE_FLUSH_EVERY lines or STATE_FLUSH_INTERVAL seconds."""
+	global state_file_handle
+	pending = 0
+	last_sync = time.monotonic()
+	while True:
+		try:
+			line = state_queue.get(timeout=STATE_FLUSH_INTERVAL)
+		except queue.Empty:
+			line = ''  # Idle: nothing new, but sync whatever is still pending
+		try:
+			if line is None:
+				if state_file_handle is not None:
+					state_file_handle.flush()
+					os.fsync(state_file_handle.fileno())
+					state_file_handle.close()
+					state_file_handle = None
+				return
+			if line:
+				if state_file_handle is None:
+					state_file_handle = open(STATE_FILE, 'a', encoding='utf-8', buffering=8192)
+				state_file_handle.write(line)
+				pending += 1
+			if pending >= STATE_FLUSH_EVERY or (pending and time.monotonic() - last_sync >= STATE_FLUSH_INTERVAL):
+				state_file_handle.flush()
+				os.fsync(state_file_handle.fileno())
+				pending = 0
+				last_sync = time.monotonic()
+			elif line and state_queue.empty():
+				state_file_handle.flush()  # Hand the batch to the OS so a later load_state() sees it
+		except Exception as e:
+			logger.error(f"Failed to write state file '{STATE_FILE}': {e}")
+		finally:
+			if line != '':
+				state_queue.task_done()  # Only after the write, so flush_state() can rely on join()
+
+def flush_state(sync=False):
+	"""Wait for the writer to append every queued URL, optionally forcing them through with fsync."""
+	if state_writer_thread is None or not state_writer_thread.is_alive():
+		return
+	state_queue.join()
+	if sync and state_file_handle is not None:
+		try:
+			os.fsync(state_file_handle.fileno())
+		except Exception as e:
+			logger.error(f"Failed to flush state file '{STATE_FILE}': {e}")
+
+def close_state():
+	"""Drain the queue, fsync and close .state, and stop the writer; safe to call more than once."""
+	global state_writer_thread
+	if state_writer_thread is None:
+		return
+	if state_writer_thread.is_alive():
+		state_queue.put(None)
+		state_writer_thread.join()
+	state_writer_thread = None
 		
+@functools.lru_cache(maxsize=4096)
+def cached_urlparse(url):
+	"""Memoized urlparse; the same identifiers and base URLs are parsed many times per run."""
+	return urlparse(url)
+
+@functools.lru_cache(maxsize=4096)
+def canonicalize_url(url):
+	"""Normalize a URL for state lookups: lowercase scheme and host, drop the fragment, sort query params."""
+	parts = urllib.parse.urlsplit(url.strip())
+	query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+	return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
+
+def get_cloud_scraper(url):
+	"""Return the run-wide CloudScraper for a URL's host, sharing the session's cookie jar."""
+	netloc = cached_urlparse(url).netloc.lower()
+	with cloud_scrapers_lock:
+		scraper = cloud_scrapers.get(netloc)
+		if scraper is None:
+			# A fresh scraper keeps cloudscraper's own browser headers and user agent; only cookies are shared
+			scraper = cloudscraper.create_scraper()
+			scraper.cookies = session.cookies
+			cloud_scrapers[netloc] = scraper
+		return scraper
+
 def is_url(string):
 	"""Check if a string is a URL by parsing it with urlparse."""
-	parsed = urlparse(string)
+	parsed = cached_urlparse(string)
 	# A string is considered a URL if it has a netloc (domain) or a scheme
 	return bool(parsed.netloc) or bool(parsed.scheme)
 
 def is_url_processed(url, state_set):
-	"""Check if a URL is in the state set."""
-	return url in state_set
+	"""Check if a URL is in the state set, as stored before canonical entries or in canonical form."""
+	return url in state_set or canonicalize_url(url) in state_set
+
+def record_processed_url(url, state_set):
+	"""Add a URL's canonical form to the in-memory state set and append it to .state."""
+	canonical_url = canonicalize_url(url)
+	state_set.add(canonical_url)
+	save_state(canonical_url)
+
+def load_site_configs():
+	"""Return (filename, config) pairs for all site configs, re-parsing only files whose mtime changed."""
+	configs = []
+	seen_paths = set()
+	changed = False
+	for config_file, config_path in list_site_config_files():
+		seen_paths.add(config_path)
+		try:
+			mtime = os.stat(config_path).st_mtime
+			cached = _SITE_CONFIG_CACHE.get(config_path)
+			if cached and cached[0] == mtime:
+				config = cached[1]
+			else:
+				with open(config_path, 'r') as f:
+					config = yaml.load(f, Loader=YamlLoader)
+				_SITE_CONFIG_CACHE[config_path] = (mtime, config)
+				changed = True
+		except Exception as e:
+			logger.warning(f"Failed to load config '{config_file}': {e}")
+			continue
+		if config:
+			configs.append((config_file, config))
+	
+	# Forget configs whose files have been removed since the last scan
+	for stale_path in set(_SITE_CONFIG_CACHE) - seen_paths:
+		del _SITE_CONFIG_CACHE[stale_path]
+		changed = True
+	
+	if changed or not _SITE_INDEX:
+		build_site_index(configs)
+	return configs
+
+def list_site_config_files():
+	"""Return (filename, path) for each .yaml in SITE_DIR, rescanning only when the directory itself changes."""
+	dir_mtime = os.stat(SITE_DIR).st_mtime_ns
+	if _SITE_DIR_LISTING['mtime'] != dir_mtime:
+		files = []
+		with os.scandir(SITE_DIR) as it:
+			for entry in it:
+				if not entry.name.endswith('.yaml') or not entry.is_file():
+					logger.debug(f"Cannot use {entry.name} because it lacks requisite .yaml extension")
+					continue
+				files.append((entry.name, entry.path))
+		_SITE_DIR_LISTING['mtime'] = dir_mtime
+		_SITE_DIR_LISTING['files'] = files
+	return _SITE_DIR_LISTING['files']
+
+def build_site_index(configs):
+	"""Rebuild the lowercased shortcode/name/domain -> (filename, config) lookup tables."""
+	_SITE_INDEX.clear()
+	_SITE_DOMAIN_INDEX.clear()
+	for config_file, config in configs:
+		# First config to claim a key wins, matching the old first-match scan
+		domain = str(config.get('domain', '')).lower()
+		if domain:
+			_SITE_DOMAIN_INDEX.setdefault(domain, (config_file, config))
+		for key in ['shortcode', 'name', 'domain']:
+			value = str(config.get(key, '')).lower()
+			if value:
+				_SITE_INDEX.setdefault(value, (config_file, config))
+
+def site_lookup_tables():
+	"""Return the (shortcode/name/domain, domain) lookup tables, scanning SITE_DIR only on first use."""
+	if not _SITE_INDEX:
+		load_site_configs()
+	return _SITE_INDEX, _SITE_DOMAIN_INDEX
 
 def load_configuration(config_type='general', identifier=None):
 	"""Load general or site-specific configuration based on identifier type."""
@@ -105,7 +416,7 @@ def load_configuration(config_type='general', identifier=None):
 		config_path = os.path.join(SCRIPT_DIR, 'config.yaml')
 		try:
 			with open(config_path, 'r') as file:
-				return yaml.safe_load(file)
+				return yaml.load(file, Loader=YamlLoader)
 		except Exception as e:
 			logger.error(f"Failed to load general config from '{config_path}': {e}")
 			raise
@@ -116,41 +427,33 @@ def load_configuration(config_type='general', identifier=None):
 		
 		identifier_lower = identifier.lower()
 		is_url_flag = is_url(identifier)
-		parsed_netloc = urlparse(identifier).netloc.lower().replace('www.', '') if is_url_flag else None
+		parsed_netloc = cached_urlparse(identifier).netloc.lower().replace('www.', '') if is_url_flag else None
 		
-		for config_file in os.listdir(SITE_DIR):
-			if config_file.endswith('.yaml'):
-				config_path = os.path.join(SITE_DIR, config_file)
-				try:
-					with open(config_path, 'r') as f:
-						config = yaml.safe_load(f)
-					if not config:
-						continue
-					
-					# Match based on identifier type
-					if is_url_flag:
-						if parsed_netloc == config.get('domain', '').lower():
-							logger.debug(f"Matched URL '{identifier}' to config '{config_file}' by domain '{config.get('domain')}'")
-							return config
-				
-					elif any(identifier_lower == config.get(key, '').lower() for key in ['shortcode', 'name', 'domain']):
-						logger.debug(f"Matched identifier '{identifier}' to config '{config_file}' by shortcode, name, or domain")
-						return config
-
-				except Exception as e:
-					logger.warning(f"Failed to load config '{config_file}': {e}")
-					continue
-			else:
-				logger.debug(f"Cannot use {config_file} because it lacks requisite .yaml extension")
+		# The index is built once per run; later lookups skip re-statting every YAML in SITE_DIR
+		site_index, domain_index = site_lookup_tables()
+		if is_url_flag:
+			config_file, config = domain_index.get(parsed_netloc, (None, None))
+			if config:
+				logger.debug(f"Matched URL '{identifier}' to config '{config_file}' by domain '{config.get('domain')}'")
+				return config
+		else:
+			config_file, config = site_index.get(identifier_lower, (None, None))
+			if config:
+				logger.debug(f"Matched identifier '{identifier}' to config '{config_file}' by shortcode, name, or domain")
+				return config
 		logger.debug(f"No site config matched for identifier '{identifier}'")
 		return None
 	
 	raise ValueError(f"Unknown config type: {config_type}")
 	
+@functools.lru_cache(maxsize=32)
+def invalid_chars_table(invalid_chars):
+	"""Build (once per distinct set of invalid chars) a str.translate table that deletes them."""
+	return str.maketrans('', '', ''.join(invalid_chars))
+
 def process_title(title, invalid_chars):
 	logger.debug(f"Processing {title} for invalid chars...")
-	for char in invalid_chars:
-		title = title.replace(char, "")
+	title = title.translate(invalid_chars_table(tuple(invalid_chars)))
 	logger.debug(f"Processed title: {title}")
 	return title
 
@@ -169,7 +472,7 @@ def construct_filename(title, site_config, general_config):
 	processed_title = process_title(title, invalid_chars)
 	
 	# Generate a unique ID if needed (6 random characters)
-	unique_id = '_' + ''.join(random.choices(string.ascii_lowercase + string.ascii_uppercase + string.digits, k=6)) if unique_name or make_unique else ''
+	unique_id = '_' + ''.join(random.choices(UNIQUE_ID_CHARS, k=6)) if unique_name or make_unique else ''
 	
 	# Calculate available length for the title, accounting for the unique ID if present
 	fixed_length = len(prefix) + len(suffix) + len(extension) + len(unique_id)
@@ -191,10 +494,11 @@ def construct_filename(title, site_config, general_config):
 		filename = f"{prefix}{processed_title}{suffix}{extension}"
 	
 	# Double-check byte length (Linux limit is 255 bytes, not chars)
-	while len(filename.encode('utf-8')) > 255:
-		excess = len(filename.encode('utf-8')) - 255
-		trim_chars = excess // 4 + 1  # Rough estimate for UTF-8; adjust conservatively
-		processed_title = processed_title[:-trim_chars].rstrip()
+	title_bytes = processed_title.encode('utf-8')
+	byte_budget = 255 - len(f"{prefix}{suffix}{unique_id}{extension}".encode('utf-8'))
+	if len(title_bytes) > byte_budget:
+		# Slice once at the byte budget; errors='ignore' drops a multibyte char split at the boundary
+		processed_title = title_bytes[:max(byte_budget, 0)].decode('utf-8', errors='ignore').rstrip()
 		
 		# Reconstruct the filename with the trimmed title
 		if unique_id:
@@ -207,18 +511,76 @@ def construct_filename(title, site_config, general_config):
 	logger.debug(f"Generated filename: {filename}")
 	return filename
 	
+def rules_overlap(a, b):
+	"""True if a suffix of one encoding-rule key is a prefix of the other."""
+	return any(a.endswith(b[:k]) or b.endswith(a[:k]) for k in range(1, min(len(a), len(b))))
+
+def compile_encoding_rules(encoding_rules):
+	"""Compile url_encoding_rules into one function equivalent to applying each replace in order."""
+	items = [(str(original), str(replacement)) for original, replacement in encoding_rules.items() if original]
+	if not items:
+		return None
+	
+	# Rules that feed into or pre-empt each other depend on order; keep sequential replaces for those
+	for i, (original, replacement) in enumerate(items):
+		for later, _ in items[i + 1:]:
+			if later in replacement or original in later or rules_overlap(original, later):
+				def apply_in_order(value):
+					for original, replacement in items:
+						value = value.replace(original, replacement)
+					return value
+				return apply_in_order
+	
+	if all(len(original) == 1 for original, _ in items):
+		table = str.maketrans(dict(items))
+		return lambda value: value.translate(table)
+	
+	mapping = dict(items)
+	pattern = re.compile('|'.join(re.escape(original) for original, _ in items))
+	return lambda value: pattern.sub(lambda m: mapping[m.group(0)], value)
+
+def get_url_encoder(site_config, mode):
+	"""Return the (encoding_rules, encoder) pair for a mode, cached on the site config."""
+	cache = site_config.setdefault('_url_encoders', {})
+	if mode not in cache:
+		encoding_rules = (
+			site_config['modes'][mode]['url_encoding_rules']
+			if mode and mode in site_config['modes'] and 'url_encoding_rules' in site_config['modes'][mode]
+			else site_config.get('url_encoding_rules', {})
+		)
+		cache[mode] = (encoding_rules, compile_encoding_rules(encoding_rules))
+	return cache[mode]
+
+def get_url_builder(base_url, pattern, site_config, mode):
+	"""Return a specialized builder for patterns needing no page arithmetic or encoding, else None."""
+	cache = site_config.setdefault('_url_builders', {})
+	key = (base_url, mode, pattern)
+	if key not in cache:
+		_, encode = get_url_encoder(site_config, mode)
+		if encode is None and not PAGE_EXPR_RE.search(pattern):
+			def build(**kwargs):
+				return urllib.parse.urljoin(base_url, pattern.format(**kwargs))
+			cache[key] = build
+		else:
+			cache[key] = None
+	return cache[key]
+
 def construct_url(base_url, pattern, site_config, mode=None, sort=None, min_duration=None, **kwargs):
-    encoding_rules = (
-        site_config['modes'][mode]['url_encoding_rules']
-        if mode and mode in site_config['modes'] and 'url_encoding_rules' in site_config['modes'][mode]
-        else site_config.get('url_encoding_rules', {})
-    )
+    # Common case: nothing to adjust or encode, so skip straight to format + urljoin
+    build = get_url_builder(base_url, pattern, site_config, mode) if not (sort or min_duration) else None
+    if build:
+        try:
+            return build(**kwargs)
+        except KeyError as e:
+            logger.error(f"Missing key in URL pattern '{pattern}': {e}")
+            return None
+
+    encoding_rules, encode = get_url_encoder(site_config, mode)
     encoded_kwargs = {}
     logger.debug(f"Constructing URL with pattern '{pattern}' and mode '{mode}' using encoding rules: {encoding_rules}")
     
     # Handle arithmetic expressions like {page - 1}, {page + 2}, etc.
-    page_pattern = r'\{page\s*([+-])\s*(\d+)\}'  # Matches {page - 1}, {page + 2}, etc.
-    match = re.search(page_pattern, pattern)
+    match = PAGE_EXPR_RE.search(pattern)
     if match and 'page' in kwargs:
         operator, value = match.group(1), int(match.group(2))
         page_value = kwargs.get('page')
@@ -237,20 +599,12 @@ def construct_url(base_url, pattern, site_config, mode=None, sort=None, min_dura
                 pattern = pattern.replace(match.group(0), str(page_value))  # Fallback to original
         else:
             pattern = pattern.replace(match.group(0), '')  # Remove if page is None
-    elif 'page' in kwargs:
-        encoded_kwargs['page'] = kwargs['page']  # Regular page handling if no arithmetic
     
-    # Encode remaining kwargs with rules
+    # Encode kwargs with rules in a single pass; page without arithmetic is handled like any other value
     for k, v in kwargs.items():
         if k == 'page' and match:  # Skip page if already handled by arithmetic
             continue
-        if isinstance(v, str):
-            encoded_v = v
-            for original, replacement in encoding_rules.items():
-                encoded_v = encoded_v.replace(original, replacement)
-            encoded_kwargs[k] = encoded_v
-        else:
-            encoded_kwargs[k] = v
+        encoded_kwargs[k] = encode(v) if encode and isinstance(v, str) else v
 
     # Add the sort and min_duration parameters to the query string
     if sort:
@@ -328,14 +682,9 @@ def get_selenium_driver(general_config, force_new=False):
 	selenium_config = general_config.get('selenium', {})
 	chromedriver_path = selenium_config.get('chromedriver_path')  # None if not specified
 	
-	create_new = force_new or 'selenium_driver' not in general_config
-	if not create_new:
-		try:
-			driver = general_config['selenium_driver']
-			driver.current_url  # Test if the driver is still valid
-		except Exception as e:
-			logger.warning(f"Existing Selenium driver invalid: {e}")
-			create_new = True
+	# Validity is tracked in-process (see release_selenium_driver) rather than probed
+	# with a Chromedriver round-trip on every call
+	create_new = force_new or not general_config.get('selenium_driver_valid', False)
 	
 	if create_new:
 		if 'selenium_driver' in general_config:
@@ -387,14 +736,24 @@ def get_selenium_driver(general_config, force_new=False):
 			})();
 		""")
 		general_config['selenium_driver'] = driver
-	
-	# Store User-Agent for later use
-	user_agent = driver.execute_script("return navigator.userAgent;")
-	general_config['selenium_user_agent'] = user_agent
-	logger.debug(f"Selenium User-Agent: {user_agent}")
+		general_config['selenium_driver_valid'] = True
+		
+		# Store User-Agent for later use
+		user_agent = driver.execute_script("return navigator.userAgent;")
+		general_config['selenium_user_agent'] = user_agent
+		logger.debug(f"Selenium User-Agent: {user_agent}")
 	return general_config['selenium_driver']
 
 
+def release_selenium_driver(driver, general_config):
+	"""Quit a Selenium driver and mark the cached one invalid so the next get_selenium_driver call replaces it."""
+	general_config['selenium_driver_valid'] = False
+	try:
+		driver.quit()
+	except Exception as e:
+		logger.debug(f"Error quitting Selenium driver: {e}")
+
+
 """def process_url(url, site_config, general_config, overwrite, re_nfo, start_page, apply_state=False, state_set=None):
 	headers = general_config.get("headers", {}).copy()
 	headers["User-Agent"] = random.choice(general_config["user_agents"])
@@ -595,7 +954,9 @@ def process_url(
                     logger.info(f"Constructed URL: {effective_url}")
 
             success = False
+            page_limiter = get_page_limiter(general_config)
             while effective_url:
+                page_limiter.acquire()
                 next_page, new_page_number, page_success = process_list_page(
                     effective_url, site_config, general_config, current_page_num, current_video_offset,
                     mode, identifier, overwrite, headers, re_nfo,
@@ -605,7 +966,6 @@ def process_url(
                 effective_url = next_page
                 current_page_num = new_page_number
                 current_video_offset = 0  # Reset after first page
-                time.sleep(general_config["sleep"]["between_pages"])
     else:
         logger.warning("URL didn't match any specific mode; attempting all configured modes.")
         available_modes = site_config.get("modes", {})
@@ -657,7 +1017,9 @@ def process_url(
                         continue
 
                 success = False
+                page_limiter = get_page_limiter(general_config)
                 while constructed_url:
+                    page_limiter.acquire()
                     next_page, new_page_number, page_success = process_list_page(
                         constructed_url, site_config, general_config, current_page_num, current_video_offset,
                         mode_name, identifier, overwrite, headers, re_nfo,
@@ -667,7 +1029,6 @@ def process_url(
                     constructed_url = next_page
                     current_page_num = new_page_number
                     current_video_offset = 0  # Reset after first page
-                    time.sleep(general_config["sleep"]["between_pages"])
                 if success:
                     logger.info(f"Mode '{mode_name}' succeeded.")
                     break
@@ -679,22 +1040,40 @@ def process_url(
     return success
 		
 
+def get_video_pool(general_config):
+	"""Return the run-wide thread pool used to process the videos on a list page concurrently."""
+	if 'video_pool' not in general_config:
+		max_workers = general_config.get('concurrency') or DEFAULT_CONCURRENCY
+		if general_config.get('vpn', {}).get('enabled', False):
+			# A new_node rotation drops every open connection, so never rotate under another worker's download
+			max_workers = 1
+		general_config['video_pool'] = ThreadPoolExecutor(max_workers=max(1, int(max_workers)))
+	return general_config['video_pool']
+
+def compiled_selector(site_config, selector):
+	"""Compile a CSS selector once per site config and reuse it for every list page."""
+	cache = site_config.setdefault('_compiled_selectors', {})
+	if selector not in cache:
+		cache[selector] = soupsieve.compile(selector)
+	return cache[selector]
+
 def process_list_page(url, site_config, general_config, page_num=1, video_offset=0, mode=None, identifier=None, overwrite=False, headers=None, new_nfo=False, do_not_ignore=False, apply_state=False, state_set=None):
 	use_selenium = site_config.get('use_selenium', False)
 	driver = get_selenium_driver(general_config) if use_selenium else None
-	soup = fetch_page(url, general_config['user_agents'], headers if headers else {}, use_selenium, driver)
+	list_scraper = site_config['scrapers']['list_scraper']
+	base_url = site_config['base_url']
+	container_selector = list_scraper['video_container']['selector']
+	soup = fetch_page(url, general_config['user_agents'], headers if headers else {}, use_selenium, driver,
+		ready_selector=ready_selector_for(container_selector))
 	if soup is None:
 		logger.error(f"Failed to fetch page: {url}")
 		return None, None, False
 	
-	list_scraper = site_config['scrapers']['list_scraper']
-	base_url = site_config['base_url']
-	container_selector = list_scraper['video_container']['selector']
 	
 	container = None
 	if isinstance(container_selector, list):
 		for selector in container_selector:
-			container = soup.select_one(selector)
+			container = compiled_selector(site_config, selector).select_one(soup)
 			if container:
 				logger.debug(f"Found container with selector '{selector}': {container.name}[class={container.get('class', [])}]")
 				break
@@ -703,7 +1082,7 @@ def process_list_page(url, site_config, general_config, page_num=1, video_offset
 			return None, None, False
 	else:
 		logger.debug(f"Searching for container with selector: '{container_selector}'")
-		container = soup.select_one(container_selector)
+		container = compiled_selector(site_config, container_selector).select_one(soup)
 		if not container:
 			logger.error(f"Could not find video container at {url} with selector '{container_selector}'")
 			return None, None, False
@@ -711,7 +1090,7 @@ def process_list_page(url, site_config, general_config, page_num=1, video_offset
 	
 	item_selector = list_scraper['video_item']['selector']
 	logger.debug(f"Searching for video items with selector: '{item_selector}'")
-	video_elements = container.select(item_selector)
+	video_elements = compiled_selector(site_config, item_selector).select(container)
 	logger.debug(f"Found {len(video_elements)} video items")
 	if not video_elements:
 		logger.debug(f"No videos found on page {page_num} with selector '{item_selector}'")
@@ -722,41 +1101,57 @@ def process_list_page(url, site_config, general_config, page_num=1, video_offset
 	print()
 	page_info = f" page {page_num}, {site_config['name'].lower()} {mode}: \"{identifier}\" "
 	page_line = page_info.center(term_width, "═")
-	print(colored(page_line, "yellow"))
+	print(colorize(page_line, "yellow"))
 	
-	success = False
-	for i, video_element in enumerate(video_elements, 1):
-		if video_offset > 0 and i < video_offset:  # Start at video_offset, 1-based
-			continue
-		
+	parsed_base = cached_urlparse(base_url)
+	base_origin = f"{parsed_base.scheme}://{parsed_base.netloc}"
+	
+	total = len(video_elements)  # Counter totals are fixed for the page; don't re-measure per item
+	
+	def process_item(i, video_element):
 		video_data = extract_data(video_element, list_scraper['video_item']['fields'], driver, site_config)
 		if 'url' in video_data:
 			video_url = video_data['url']
-			if not video_url.startswith(('http://', 'https://')):
-				video_url = f"http:{video_url}" if video_url.startswith('//') else urllib.parse.urljoin(base_url, video_url)
+			if not video_url.startswith(HTTP_PREFIXES):
+				if video_url.startswith('//'):
+					video_url = f"http:{video_url}"
+				elif video_url.startswith('/') and '/.' not in video_url:
+					video_url = base_origin + video_url  # Root-relative; no need for a full urljoin
+				else:
+					video_url = urllib.parse.urljoin(base_url, video_url)
 		elif 'video_key' in video_data:
 			video_url = construct_url(base_url, site_config['modes']['video']['url_pattern'], site_config, mode='video', video=video_data['video_key'])
 		else:
 			logger.warning("Unable to construct video URL")
-			continue
+			return False
 		video_title = video_data.get('title', '').strip() or video_element.text.strip()
+		if stop_event.is_set():
+			return False
 		
-		print()
-		counter = f"{i} of {len(video_elements)}"
-		counter_line = f"┈┈┈ {counter} ┈ {video_url} ".ljust(term_width, "┈")
-		print(colored(counter_line, "magenta"))
+		counter_line = f"┈┈┈ {i} of {total} ┈ {video_url} ".ljust(term_width, "┈")
+		with print_lock:  # Keep each counter block intact when workers print at once
+			print()
+			print(colorize(counter_line, "magenta"))
 		
 		if is_url_processed(video_url, state_set) and not (overwrite or new_nfo):
 			logger.info(f"Skipping already processed video: {video_url}")
-			success = True
-			continue
+			return True
 		
-		video_success = process_video_page(video_url, site_config, general_config, overwrite, headers, new_nfo, do_not_ignore, apply_state=apply_state, state_set=state_set)
-		if video_success:
-			success = True
+		return process_video_page(video_url, site_config, general_config, overwrite, headers, new_nfo, do_not_ignore, apply_state=apply_state, state_set=state_set)
+	
+	# Start at video_offset, 1-based
+	items = [(i, video_element) for i, video_element in enumerate(video_elements, 1) if not (video_offset > 0 and i < video_offset)]
+	if use_selenium:
+		# A single shared Chrome session can't drive several video pages at once
+		results = [process_item(i, video_element) for i, video_element in items]
+	else:
+		pool = get_video_pool(general_config)
+		futures = [pool.submit(process_item, i, video_element) for i, video_element in items]
+		results = [future.result() for future in as_completed(futures)]
+	success = any(results)
 	
 	if driver:
-		driver.quit()
+		release_selenium_driver(driver, general_config)
 	
 	if mode not in site_config['modes']:
 		logger.warning(f"No pagination for mode '{mode}' as it’s not defined in site_config['modes']")
@@ -788,7 +1183,7 @@ def process_list_page(url, site_config, general_config, page_num=1, video_offset
 			next_page = soup.select_one(next_page_config.get('selector', ''))
 			if next_page:
 				next_url = next_page.get(next_page_config.get('attribute', 'href'))
-				if next_url and not next_url.startswith(('http://', 'https://')):
+				if next_url and not next_url.startswith(HTTP_PREFIXES):
 					next_url = urllib.parse.urljoin(base_url, next_url)
 				logger.info(f"Found next page URL (selector-based): {next_url}")
 			else:
@@ -804,8 +1199,14 @@ def process_rss_feed(url, site_config, general_config, overwrite=False, headers=
 	"""Process an RSS feed, downloading videos from oldest to newest."""
 	logger.info(f"Fetching RSS feed: {url}")
 	
-	# Fetch the RSS feed
-	feed = feedparser.parse(url)
+	# Fetch the RSS feed over the pooled session, then hand the body to feedparser
+	try:
+		with session.get(url, headers=headers or {}, timeout=30) as response:
+			response.raise_for_status()
+			feed = feedparser.parse(response.content)
+	except requests.exceptions.RequestException as e:
+		logger.error(f"Failed to fetch RSS feed at {url}: {e}")
+		return False
 	if feed.bozo:
 		logger.error(f"Failed to parse RSS feed at {url}: {feed.bozo_exception}")
 		return False
@@ -824,28 +1225,36 @@ def process_rss_feed(url, site_config, general_config, overwrite=False, headers=
 	print()
 	feed_info = f" RSS feed for {site_config['name']} "
 	feed_line = feed_info.center(term_width, "═")
-	print(colored(feed_line, "yellow"))
+	print(colorize(feed_line, "yellow"))
 	
-	success = False
 	rss_scraper = site_config['scrapers']['rss_scraper']
 	
-	for i, entry in enumerate(entries, 1):
+	total = len(entries)
+	
+	def process_entry(i, entry):
 		# Extract video URL from the <link> element
 		video_url = entry.get('link', '')
 		if not video_url or not is_url(video_url):
 			logger.warning(f"Entry {i} has no valid URL; skipping")
-			continue
+			return False
+		
+		# Check state before building and parsing the entry; feeds often repeat links with tracking params
+		if is_url_processed(video_url, state_set) and not (overwrite or re_nfo):
+			logger.info(f"Skipping already processed video: {video_url}")
+			return True
 		
 		# Convert feedparser entry to XML string for BeautifulSoup
-		entry_xml = '<item>'
-		entry_xml += f'<title><![CDATA[{entry.get("title", "")}]]></title>'
-		entry_xml += f'<link><![CDATA[{entry.get("link", "")}]]></link>'
-		entry_xml += f'<description><![CDATA[{entry.get("description", "")}]]></description>'
+		parts = [
+			'<item>',
+			f'<title><![CDATA[{entry.get("title", "")}]]></title>',
+			f'<link><![CDATA[{entry.get("link", "")}]]></link>',
+			f'<description><![CDATA[{entry.get("description", "")}]]></description>',
+		]
 		if 'content' in entry and entry.content:
-			entry_xml += f'<content:encoded><![CDATA[{entry.content[0].value}]]></content:encoded>'
-		for category in entry.get('categories', []):
-			entry_xml += f'<category><![CDATA[{category[0]}]]></category>'
-		entry_xml += '</item>'
+			parts.append(f'<content:encoded><![CDATA[{entry.content[0].value}]]></content:encoded>')
+		parts.extend(f'<category><![CDATA[{category[0]}]]></category>' for category in entry.get('categories', []))
+		parts.append('</item>')
+		entry_xml = ''.join(parts)
 		
 		# Parse the entry with BeautifulSoup using lxml parser
 		entry_soup = BeautifulSoup(entry_xml, 'lxml-xml')  # Use lxml-xml for proper XML parsing
@@ -857,34 +1266,37 @@ def process_rss_feed(url, site_config, general_config, overwrite=False, headers=
 		video_title = video_data.get('title', '').strip() or entry.get('title', 'Untitled').strip()
 		video_data['title'] = video_title
 		video_data['URL'] = video_url
+		if stop_event.is_set():
+			return False
 		
-		print()
-		counter = f"{i} of {len(entries)}"
-		counter_line = f"┈┈┈ {counter} ┈ {video_url} ".ljust(term_width, "┈")
-		print(colored(counter_line, "magenta"))
-		
-		if is_url_processed(video_url, state_set) and not (overwrite or re_nfo):
-			logger.info(f"Skipping already processed video: {video_url}")
-			success = True
-			continue
+		counter_line = f"┈┈┈ {i} of {total} ┈ {video_url} ".ljust(term_width, "┈")
+		with print_lock:  # Keep each counter block intact when workers print at once
+			print()
+			print(colorize(counter_line, "magenta"))
 		
 		# Process the video page
-		video_success = process_video_page(
+		return process_video_page(
 			video_url, site_config, general_config, overwrite, headers, re_nfo,
 			apply_state=apply_state, state_set=state_set
 		)
-		if video_success:
-			success = True
 	
-	return success
+	if site_config.get('use_selenium', False):
+		# A single shared Chrome session can't drive several video pages at once
+		results = [process_entry(i, entry) for i, entry in enumerate(entries, 1)]
+	else:
+		# Entries are submitted oldest first, but downloads overlap on the shared worker pool
+		pool = get_video_pool(general_config)
+		futures = [pool.submit(process_entry, i, entry) for i, entry in enumerate(entries, 1)]
+		results = [future.result() for future in as_completed(futures)]
+	return any(results)
 
 def process_video_page(url, site_config, general_config, overwrite=False, headers=None, new_nfo=False, do_not_ignore=False, apply_state=False, state_set=None):
 	global last_vpn_action_time
 	vpn_config = general_config.get('vpn', {})
 	if vpn_config.get('enabled', False):
-		current_time = time.time()
-		if current_time - last_vpn_action_time > vpn_config.get('new_node_time', 300):
-			handle_vpn(general_config, 'new_node')
+		with vpn_lock:  # Only one worker thread should rotate the VPN node
+			if time.monotonic() - last_vpn_action_time > vpn_config.get('new_node_time', 300):
+				handle_vpn(general_config, 'new_node')
 	
 	logger.info(f"Processing video page: {url}")
 	use_selenium = site_config.get('use_selenium', False)
@@ -894,6 +1306,8 @@ def process_video_page(url, site_config, general_config, overwrite=False, header
 	iframe_url = None
 	video_url = None
 	raw_data = {'title': original_url.split('/')[-2]}
+	title_config = site_config['scrapers']['video_scraper'].get('title', {})
+	title_selector = ready_selector_for(title_config.get('selector') if isinstance(title_config, dict) else title_config)
 	
 	if site_config.get('m3u8_mode', False) and driver:
 		video_scraper = site_config['scrapers']['video_scraper']
@@ -902,14 +1316,14 @@ def process_video_page(url, site_config, general_config, overwrite=False, header
 		if iframe_config:
 			logger.debug(f"Piercing iframe '{iframe_config['selector']}' for M3U8")
 			driver.get(original_url)
-			time.sleep(random.uniform(1, 2))
+			wait_for_page(driver, iframe_config['selector'])
 			try:
 				iframe = driver.find_element(By.CSS_SELECTOR, iframe_config['selector'])
 				iframe_url = iframe.get_attribute("src")
 				if iframe_url:
 					logger.info(f"Found iframe: {iframe_url}")
 					driver.get(iframe_url)
-					time.sleep(random.uniform(1, 2))
+					wait_for_page(driver)
 					m3u8_url, cookies = extract_m3u8_urls(driver, iframe_url, site_config)
 					if m3u8_url:
 						video_url = m3u8_url
@@ -918,19 +1332,19 @@ def process_video_page(url, site_config, general_config, overwrite=False, header
 										"User-Agent": general_config.get('selenium_user_agent', random.choice(general_config['user_agents']))})
 			except Exception as e:
 				logger.warning(f"Iframe error: {e}")
-		soup = fetch_page(original_url, general_config['user_agents'], headers or {}, use_selenium, driver)
+		soup = fetch_page(original_url, general_config['user_agents'], headers or {}, use_selenium, driver, ready_selector=title_selector)
 		if soup:
 			raw_data = extract_data(soup, site_config['scrapers']['video_scraper'], driver, site_config)
 		video_url = video_url or raw_data.get('download_url')
 	else:
-		soup = fetch_page(original_url, general_config['user_agents'], headers or {}, use_selenium, driver)
+		soup = fetch_page(original_url, general_config['user_agents'], headers or {}, use_selenium, driver, ready_selector=title_selector)
 		if soup is None and use_selenium:
 			logger.warning("Selenium failed; retrying with requests")
 			soup = fetch_page(original_url, general_config['user_agents'], headers or {}, False, None)
 		if soup is None:
 			logger.error(f"Failed to fetch: {original_url}")
 			if driver:
-				driver.quit()
+				release_selenium_driver(driver, general_config)
 			return False
 		raw_data = extract_data(soup, site_config['scrapers']['video_scraper'], driver, site_config)
 		video_url = raw_data.get('download_url')
@@ -942,34 +1356,40 @@ def process_video_page(url, site_config, general_config, overwrite=False, header
 	
 	if not do_not_ignore and should_ignore_video(raw_data, general_config['ignored']):
 		if driver:
-			driver.quit()
+			release_selenium_driver(driver, general_config)
 		return True
 	
+	if stop_event.is_set():
+		logger.info(f"Stopping before downloading {original_url}")
+		if driver:
+			release_selenium_driver(driver, general_config)
+		return False
+	
 	final_metadata = finalize_metadata(raw_data, general_config)
 	file_name = construct_filename(final_metadata['title'], site_config, general_config)
+	nfo_name = f"{file_name.rsplit('.', 1)[0]}.nfo"  # Derived once; used by every NFO path below
 	destination_config = general_config['download_destinations'][0]
+	is_smb = destination_config['type'] == 'smb'
 	state_updated = False
-	if destination_config['type'] == 'smb':
+	if is_smb:
 		smb_path = os.path.join(destination_config['path'], file_name)
 		if not overwrite and file_exists_on_smb(destination_config, smb_path):
 			logger.info(f"File '{smb_path}' exists on SMB share. Skipping download.")
 			if apply_state and not is_url_processed(original_url, state_set):
-				state_set.add(original_url)
-				save_state(original_url)
+				record_processed_url(original_url, state_set)
 				logger.info(f"Retroactively added {original_url} to state due to existing file and --applystate")
 				state_updated = True
 			if general_config.get('make_nfo', False) and has_metadata_selectors(site_config):
-				smb_nfo_path = os.path.join(destination_config['path'], f"{file_name.rsplit('.', 1)[0]}.nfo")
+				smb_nfo_path = os.path.join(destination_config['path'], nfo_name)
 				if not (new_nfo or file_exists_on_smb(destination_config, smb_nfo_path)):
-					temp_nfo_path = os.path.join(tempfile.gettempdir(), 'smutscrape', f"{file_name.rsplit('.', 1)[0]}.nfo")
+					temp_nfo_path = os.path.join(tempfile.gettempdir(), 'smutscrape', nfo_name)
 					os.makedirs(os.path.dirname(temp_nfo_path), exist_ok=True)
 					generate_nfo(temp_nfo_path, final_metadata, True)
 					upload_to_smb(temp_nfo_path, smb_nfo_path, destination_config, overwrite)
 					os.remove(temp_nfo_path)
 			if driver:
-				driver.quit()
+				release_selenium_driver(driver, general_config)
 			return True
-	if destination_config['type'] == 'smb':
 		temp_dir = destination_config.get('temporary_storage', os.path.join(tempfile.gettempdir(), 'smutscrape'))
 		os.makedirs(temp_dir, exist_ok=True)
 		final_destination_path = os.path.join(temp_dir, file_name)
@@ -981,7 +1401,7 @@ def process_video_page(url, site_config, general_config, overwrite=False, header
 		temp_destination_path = final_destination_path  # No prefix for local
 	
 	# Check for existing complete file in temp dir
-	if destination_config['type'] == 'smb' and not overwrite and os.path.exists(final_destination_path):
+	if is_smb and not overwrite and os.path.exists(final_destination_path):
 		video_info = get_video_metadata(final_destination_path)
 		if video_info:
 			logger.info(f"Valid complete file '{final_destination_path}' exists in temp dir. Skipping download.")
@@ -995,21 +1415,35 @@ def process_video_page(url, site_config, general_config, overwrite=False, header
 	if success and general_config.get('make_nfo', False) and has_metadata_selectors(site_config):
 		logger.debug(f"Successful video download, now generating nfo.")
 		generate_nfo(final_destination_path, final_metadata, overwrite or new_nfo)
-	if success and destination_config['type'] == 'smb':
+	if success and is_smb and stop_event.is_set():
+		logger.info(f"Stopping before uploading '{final_destination_path}'; it stays in temporary storage")
+		success = False
+	if success and is_smb:
 		logger.debug(f"Successful video download, now managing file.")
-		manage_file(final_destination_path, destination_config, overwrite, video_url=original_url, state_set=state_set)
+		# A failed upload keeps the temp copy; leave the URL out of .state so the next run retries it
+		success = manage_file(final_destination_path, destination_config, overwrite, video_url=original_url, state_set=state_set)
 	
 	if success and not is_url_processed(original_url, state_set):
 		logger.debug(f"Adding {original_url} to state")
-		state_set.add(original_url)
-		save_state(original_url)
+		record_processed_url(original_url, state_set)
 	
 	if driver:
-		driver.quit()
-	time.sleep(general_config['sleep']['between_videos'])
+		release_selenium_driver(driver, general_config)
+	stop_event.wait(general_config['sleep']['between_videos'])  # Sleeps, but wakes at once on shutdown
 	return success or state_updated
 
 
+def wait_for_page(driver, selector=None, timeout=SELENIUM_WAIT_TIMEOUT):
+	"""Wait until the document has loaded (and selector, if given, is present) instead of a fixed sleep."""
+	try:
+		WebDriverWait(driver, timeout).until(lambda d: d.execute_script("return document.readyState") == "complete")
+		if selector:
+			WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+		return True
+	except TimeoutException:
+		logger.debug(f"Timed out after {timeout}s waiting for {selector or 'page load'}; continuing")
+		return False
+
 def pierce_iframe(driver, url, site_config):
 	"""
 	Attempts to pierce into an iframe if specified in site_config.
@@ -1022,16 +1456,18 @@ def pierce_iframe(driver, url, site_config):
 	
 	logger.debug(f"Attempting iframe piercing for: {url}")
 	driver.get(url)
-	time.sleep(random.uniform(1, 2))  # Initial page load
+	iframe_selector = iframe_config.get('selector', 'iframe')
+	wait_for_page(driver, iframe_selector)
 	
 	try:
-		iframe_selector = iframe_config.get('selector', 'iframe')
 		iframe = driver.find_element(By.CSS_SELECTOR, iframe_selector)
 		iframe_url = iframe.get_attribute("src")
 		if iframe_url:
 			logger.info(f"Found iframe with src: {iframe_url}")
 			driver.get(iframe_url)
-			time.sleep(random.uniform(1, 2)) 
+			ready_selector = iframe_config.get('ready_selector')
+			if not ready_selector or not wait_for_page(driver, ready_selector):
+				time.sleep(random.uniform(1, 2))
 			return iframe_url
 		else:
 			logger.warning("Iframe found but no src attribute.")
@@ -1040,6 +1476,17 @@ def pierce_iframe(driver, url, site_config):
 		logger.warning(f"No iframe found or error piercing: {e}")
 		return url
 
+def m3u8_resolution_score(url):
+	"""Pixel count implied by a resolution token in a manifest URL (WxH, else a 16:9 NNNp); 0 if none."""
+	match = RESOLUTION_RE.search(url)
+	if match:
+		return int(match.group(1)) * int(match.group(2))
+	match = HEIGHT_RE.search(url)
+	if match:
+		height = int(match.group(1))
+		return height * height * 16 // 9
+	return 0
+
 def extract_m3u8_urls(driver, url, site_config):
 	logger.debug(f"Extracting M3U8 URLs from: {url}")
 	# URL is already loaded (iframe or original) by process_video_page
@@ -1057,44 +1504,63 @@ def extract_m3u8_urls(driver, url, site_config):
 		})();
 	""")
 
-	time.sleep(5)
-	
-	logs = driver.get_log("performance")
+	# Poll the performance log (each read drains it) until manifests show up, then take one
+	# more poll to catch the variant playlists that follow the master, rather than sleeping 5s
 	m3u8_urls = []
-	logger.debug(f"Analyzing {len(logs)} performance logs")
-	for log in logs:
-		try:
-			message = json.loads(log["message"])["message"]
-			if "Network.responseReceived" in message["method"]:
-				request_url = message["params"]["response"]["url"]
-				if ".m3u8" in request_url:
-					m3u8_urls.append(request_url)
-					logger.debug(f"Found M3U8 URL: {request_url}")
-		except KeyError:
-			continue
+	log_count = 0
+	deadline = time.monotonic() + SELENIUM_WAIT_TIMEOUT
+	while True:
+		found_before = len(m3u8_urls)
+		logs = driver.get_log("performance")
+		log_count += len(logs)
+		for log in logs:
+			raw_message = log["message"]
+			# Cheap substring tests rule out nearly every entry before paying for a JSON parse
+			if ".m3u8" not in raw_message or "Network.responseReceived" not in raw_message:
+				continue
+			try:
+				message = json_loads(raw_message)["message"]
+				if "Network.responseReceived" in message["method"]:
+					request_url = message["params"]["response"]["url"]
+					if ".m3u8" in request_url:
+						m3u8_urls.append(request_url)
+						logger.debug(f"Found M3U8 URL: {request_url}")
+			except KeyError:
+				continue
+		if (found_before and len(m3u8_urls) == found_before) or time.monotonic() >= deadline:
+			break
+		time.sleep(0.25)
+	logger.debug(f"Analyzed {log_count} performance logs")
 	
 	if not m3u8_urls:
 		logger.warning("No M3U8 URLs detected in network traffic")
 		return None, None
 	
-	best_m3u8 = sorted(m3u8_urls, key=lambda u: "1920x1080" in u, reverse=True)[0]
+	best_m3u8 = max(dict.fromkeys(m3u8_urls), key=m3u8_resolution_score)
 	cookies_list = driver.get_cookies()
 	cookies_str = "; ".join([f"{c['name']}={c['value']}" for c in cookies_list])
 	logger.debug(f"Cookies after load: {cookies_str if cookies_str else 'None'}")
 	logger.info(f"Selected best M3U8: {best_m3u8}")
 	return best_m3u8, cookies_str
 
-def fetch_page(url, user_agents, headers, use_selenium=False, driver=None, retry_count=0):
+def ready_selector_for(selector):
+	"""Collapse a scraper selector (string or list of fallbacks) into one CSS selector Selenium can wait on."""
+	if isinstance(selector, list):
+		return ', '.join(s for s in selector if isinstance(s, str)) or None
+	return selector if isinstance(selector, str) else None
+
+def fetch_page(url, user_agents, headers, use_selenium=False, driver=None, retry_count=0, ready_selector=None):
 	if not use_selenium:
-		scraper = cloudscraper.create_scraper()
 		if 'User-Agent' not in headers:
 			headers['User-Agent'] = random.choice(user_agents)
 		logger.debug(f"Fetching URL (requests): {url}")
 		time.sleep(random.uniform(1, 3))
 		try:
-			response = scraper.get(url, headers=headers, timeout=30)
-			response.raise_for_status()
-			return BeautifulSoup(response.content, "html.parser")
+			# Close the response as soon as it is parsed so the body buffer is freed and the
+			# connection goes straight back to the pool instead of living as long as the soup
+			with get_cloud_scraper(url).get(url, headers=headers, timeout=30) as response:
+				response.raise_for_status()
+				return BeautifulSoup(response.content, HTML_PARSER)
 		except requests.exceptions.RequestException as e:
 			logger.error(f"Error fetching {url}: {e}")
 			return None
@@ -1111,62 +1577,123 @@ def fetch_page(url, user_agents, headers, use_selenium=False, driver=None, retry
 				driver.get(url)
 				final_url = url
 			logger.debug(f"Final URL after iframe handling: {final_url}")
-			time.sleep(random.uniform(2, 4))
-			return BeautifulSoup(driver.page_source, 'html.parser')
+			# Wait on the site's own list/video selector; without one (or if it never shows) keep the old delay
+			if not ready_selector or not wait_for_page(driver, ready_selector):
+				time.sleep(random.uniform(2, 4))
+			return BeautifulSoup(driver.page_source, HTML_PARSER)
 		except Exception as e:
 			if retry_count < 2 and 'general_config' in globals():
 				logger.warning(f"Selenium error: {e}. Retrying with new session...")
 				new_driver = get_selenium_driver(globals()['general_config'], force_new=True)
 				if new_driver:
-					return fetch_page(url, user_agents, headers, use_selenium, new_driver, retry_count + 1)
+					return fetch_page(url, user_agents, headers, use_selenium, new_driver, retry_count + 1, ready_selector)
 			logger.error(f"Failed to fetch {url} with Selenium: {e}")
 			return None
 
 
 
+MULTI_VALUE_FIELDS = ('tags', 'actors', 'producers', 'studios')
+
+def compile_post_process(steps):
+	"""Turn a postProcess list into (op, ...) tuples with its replace regexes compiled up front."""
+	ops = []
+	for step in steps:
+		if 'replace' in step:
+			pairs = []
+			for pair in step['replace']:
+				regex, replacement = pair['regex'], pair['with']
+				try:
+					pattern = re.compile(regex, re.DOTALL)
+				except re.error as e:
+					pattern = e  # Reported (and the value blanked) when applied, as before
+				pairs.append((regex, pattern, replacement))
+			ops.append(('replace', pairs))
+		elif 'max_attribute' in step:
+			ops.append(('max_attribute', step.get('attribute'), step.get('type', 'str')))
+		elif 'first' in step and step['first']:
+			ops.append(('first',))
+	return ops
+
+def compile_field_specs(selectors):
+	"""Resolve each field's selector config into a flat spec once, so extract_data skips the config branching."""
+	specs = []
+	for field, config in selectors.items():
+		is_dict = isinstance(config, dict)
+		attribute = config['attribute'] if is_dict and 'attribute' in config else None
+		if isinstance(config, str):
+			kind, target = 'select', [config]
+		elif not is_dict:
+			kind, target = 'none', None
+		elif 'selector' in config:
+			selector = config['selector']
+			if isinstance(selector, list):
+				kind, target = 'select', selector
+			elif '|' in selector:
+				# Handle namespace in selector (e.g., "content|encoded")
+				namespace, tag = selector.split('|', 1)
+				kind, target = 'find_all', f"{namespace}:{tag}"
+			else:
+				kind, target = 'select', [selector]
+		elif 'attribute' in config:
+			kind, target = 'self', None
+		else:
+			kind, target = 'none', None
+		if kind == 'select' and attribute is None and field not in MULTI_VALUE_FIELDS:
+			kind = 'select_one'  # Only the first match's text is used, so stop at the first hit
+		post_process = compile_post_process(config['postProcess']) if is_dict and 'postProcess' in config else None
+		# Without a driver, iframe fields fall back to the plain selector lookup above
+		iframe = (config['iframe'], config.get('selector', '')) if is_dict and 'iframe' in config else None
+		specs.append((field, kind, target, iframe, attribute, is_dict, post_process))
+	return specs
+
+def get_field_specs(selectors, site_config=None):
+	"""Field specs for a scraper's selectors, cached on the site config across pages."""
+	if site_config is None:
+		return compile_field_specs(selectors)
+	cache = site_config.setdefault('_field_specs', {})
+	key = id(selectors)
+	if key not in cache:
+		cache[key] = (selectors, compile_field_specs(selectors))  # Holding selectors keeps its id from being reused
+	return cache[key][1]
+
 def extract_data(soup, selectors, driver=None, site_config=None):
 	data = {}
 	if soup is None:
 		logger.error("Soup is None; cannot extract data")
 		return data
 	
-	for field, config in selectors.items():
+	for field, kind, target, iframe, attribute, is_dict, post_process in get_field_specs(selectors, site_config):
 		if field == 'download_url' and site_config.get('m3u8_mode', False):
 			continue
-		if isinstance(config, str):
-			elements = soup.select(config)
-		elif isinstance(config, dict):
-			if 'iframe' in config and driver and site_config:
-				iframe_selector = config['iframe']
-				logger.debug(f"Piercing iframe '{iframe_selector}' for field '{field}'")
-				try:
-					iframe = driver.find_element(By.CSS_SELECTOR, iframe_selector)
-					driver.switch_to.frame(iframe)
-					iframe_soup = BeautifulSoup(driver.page_source, 'html.parser')
-					elements = iframe_soup.select(config.get('selector', ''))
-					driver.switch_to.default_content()
-				except Exception as e:
-					logger.error(f"Failed to pierce iframe '{iframe_selector}' for '{field}': {e}")
-					elements = []
-			elif 'selector' in config:
-				selector = config['selector']
-				if isinstance(selector, list):
-					elements = []
-					for sel in selector:
-						elements.extend(soup.select(sel))
-						if elements:
-							break
-				else:
-					# Handle namespace in selector (e.g., "content|encoded")
-					if '|' in selector:
-						namespace, tag = selector.split('|', 1)
-						elements = soup.find_all(f"{namespace}:{tag}")
-					else:
-						elements = soup.select(selector)
-			elif 'attribute' in config:
-				elements = [soup]
-			else:
+		if iframe and driver and site_config:
+			iframe_selector, selector = iframe
+			logger.debug(f"Piercing iframe '{iframe_selector}' for field '{field}'")
+			try:
+				iframe_element = driver.find_element(By.CSS_SELECTOR, iframe_selector)
+				driver.switch_to.frame(iframe_element)
+				iframe_soup = BeautifulSoup(driver.page_source, HTML_PARSER)
+				elements = iframe_soup.select(selector)
+				driver.switch_to.default_content()
+			except Exception as e:
+				logger.error(f"Failed to pierce iframe '{iframe_selector}' for '{field}': {e}")
 				elements = []
+		elif kind == 'select':
+			elements = []
+			for sel in target:
+				elements = soup.select(sel)
+				if elements:
+					break
+		elif kind == 'select_one':
+			elements = []
+			for sel in target:
+				element = soup.select_one(sel)
+				if element is not None:
+					elements = [element]
+					break
+		elif kind == 'find_all':
+			elements = soup.find_all(target)
+		elif kind == 'self':
+			elements = [soup]
 		else:
 			elements = []
 		
@@ -1175,12 +1702,12 @@ def extract_data(soup, selectors, driver=None, site_config=None):
 			logger.debug(f"No elements found for '{field}'")
 			continue
 		
-		if isinstance(config, dict) and 'attribute' in config:
+		if attribute is not None:
 			# Handle attribute-based extraction (e.g., href, src)
-			values = [element.get(config['attribute']) for element in elements if element.get(config['attribute'])]
+			values = [element.get(attribute) for element in elements if element.get(attribute)]
 			value = values[0] if len(values) == 1 else values if values else ''
 			if value is None:
-				logger.debug(f"Attribute '{config['attribute']}' for '{field}' is None; defaulting to empty string")
+				logger.debug(f"Attribute '{attribute}' for '{field}' is None; defaulting to empty string")
 				value = ''
 		else:
 			# Handle text-based extraction
@@ -1189,36 +1716,35 @@ def extract_data(soup, selectors, driver=None, site_config=None):
 				value = ''
 		
 		# Handle multi-value fields with deduplication only for text-based fields
-		if field in ['tags', 'actors', 'producers', 'studios'] and not (isinstance(config, dict) and 'attribute' in config):
-			values = [element.text.strip() for element in elements if hasattr(element, 'text') and element.text and element.text.strip()]
-			normalized_values = {v.lower() for v in values if v}
-			value = [v for v in values if v.lower() in normalized_values]
-			seen = set()
-			value = [v for v in value if not (v.lower() in seen or seen.add(v.lower()))]
+		if field in MULTI_VALUE_FIELDS and attribute is None:
+			# One pass keyed by lowercase keeps the first-seen casing of each value
+			seen = {}
+			for element in elements:
+				text = element.text.strip() if hasattr(element, 'text') and element.text else ''
+				if text:
+					seen.setdefault(text.lower(), text)
+			value = list(seen.values())
 		
 		# Apply post-processing if present
-		if isinstance(config, dict) and 'postProcess' in config:
-			for step in config['postProcess']:
-				if 'replace' in step:
-					for pair in step['replace']:
-						regex, replacement = pair['regex'], pair['with']
-						try:
-							if isinstance(value, list):
-								value = [re.sub(regex, replacement, v, flags=re.DOTALL) if v else '' for v in value]
-							else:
-								old_value = value
-								value = re.sub(regex, replacement, value, flags=re.DOTALL) if value else ''
-								if value != old_value:
-									logger.debug(f"Applied regex '{regex}' -> '{replacement}' for '{field}': {value}")
-						except re.error as e:
-							logger.error(f"Regex error for '{field}': regex={regex}, error={e}")
+		if post_process is not None:
+			for op in post_process:
+				if op[0] == 'replace':
+					for regex, pattern, replacement in op[1]:
+						if isinstance(pattern, re.error):
+							logger.error(f"Regex error for '{field}': regex={regex}, error={pattern}")
 							value = ''
-				elif 'max_attribute' in step:
+						elif isinstance(value, list):
+							value = [pattern.sub(replacement, v) if v else '' for v in value]
+						else:
+							old_value = value
+							value = pattern.sub(replacement, value) if value else ''
+							if value != old_value:
+								logger.debug(f"Applied regex '{regex}' -> '{replacement}' for '{field}': {value}")
+				elif op[0] == 'max_attribute':
 					if not isinstance(value, list):
 						logger.debug(f"Skipping max_attribute for '{field}' as value is not a list: {value}")
 						continue
-					attr_name = step.get('attribute')
-					attr_type = step.get('type', 'str')
+					_, attr_name, attr_type = op
 					if not attr_name:
 						logger.error(f"max_attribute for '{field}' missing 'attribute' key")
 						continue
@@ -1239,11 +1765,11 @@ def extract_data(soup, selectors, driver=None, site_config=None):
 					except (ValueError, TypeError) as e:
 						logger.error(f"Failed to convert '{attr_name}' to {attr_type} for '{field}': {e}")
 						value = value[0] if value else ''
-				elif 'first' in step and step['first'] and isinstance(value, list):
+				elif op[0] == 'first' and isinstance(value, list):
 					value = value[0] if value else ''
 		
 		# Default to first value for lists without postProcess, except multi-value fields
-		if isinstance(config, dict) and 'postProcess' not in config and isinstance(value, list) and field not in ['tags', 'actors', 'studios']:
+		if is_dict and post_process is None and isinstance(value, list) and field not in ['tags', 'actors', 'studios']:
 			value = value[0] if value else ''
 			logger.debug(f"No postProcess for '{field}' with multiple values; defaulted to first: {value}")
 		
@@ -1254,30 +1780,39 @@ def extract_data(soup, selectors, driver=None, site_config=None):
 
 
 	
+@functools.lru_cache(maxsize=4)
+def compile_ignored_terms(ignored_terms):
+	"""Fuse all ignored terms (plain and hyphen-encoded) into one case-insensitive word-boundary alternation.
+	
+	Each variant gets its own capture group, so match.lastindex maps back into the returned tuple of
+	configured terms (matched text can't be lowercased back to a key: 'ſ' or 'İ' match case-insensitively
+	but lowercase to something else). Also returns the shortest variant's length for a cheap pre-check.
+	"""
+	variants = {}
+	for term in ignored_terms:
+		term_lower = term.lower()
+		variants.setdefault(term_lower, term_lower)
+		variants.setdefault(term_lower.replace(' ', '-'), term_lower)
+	pattern = re.compile(r'\b(?:' + '|'.join(f'({re.escape(variant)})' for variant in variants) + r')\b', re.IGNORECASE)
+	return pattern, tuple(variants.values()), min(map(len, variants))
+
 def should_ignore_video(data, ignored_terms):
 	if not ignored_terms:
 		return False
-	ignored_terms_lower = [term.lower() for term in ignored_terms]
-	ignored_terms_encoded = [term.lower().replace(' ', '-') for term in ignored_terms]
-	
-	# Compile regex patterns with word boundaries for efficiency
-	term_patterns = [re.compile(r'\b' + re.escape(term) + r'\b') for term in ignored_terms_lower]
-	encoded_patterns = [re.compile(r'\b' + re.escape(encoded) + r'\b') for encoded in ignored_terms_encoded]
+	pattern, group_terms, min_length = compile_ignored_terms(tuple(ignored_terms))
 	
 	for field, value in data.items():
 		if isinstance(value, str):
-			value_lower = value.lower()
-			for term, term_pattern, encoded_pattern in zip(ignored_terms_lower, term_patterns, encoded_patterns):
-				if term_pattern.search(value_lower) or encoded_pattern.search(value_lower):
-					logger.warning(f"Ignoring video due to term '{term}' in {field}: '{value}'")
-					return True
+			match = len(value) >= min_length and pattern.search(value)
+			if match:
+				logger.warning(f"Ignoring video due to term '{group_terms[match.lastindex - 1]}' in {field}: '{value}'")
+				return True
 		elif isinstance(value, list):
 			for item in value:
-				item_lower = item.lower()
-				for term, term_pattern, encoded_pattern in zip(ignored_terms_lower, term_patterns, encoded_patterns):
-					if term_pattern.search(item_lower) or encoded_pattern.search(item_lower):
-						logger.warning(f"Ignoring video due to term '{term}' in {field}: '{item}'")
-						return True
+				match = len(item) >= min_length and pattern.search(item)
+				if match:
+					logger.warning(f"Ignoring video due to term '{group_terms[match.lastindex - 1]}' in {field}: '{item}'")
+					return True
 	return False
 
 def apply_permissions(file_path, destination_config):
@@ -1298,33 +1833,188 @@ def apply_permissions(file_path, destination_config):
 
 
 
-def upload_to_smb(local_path, smb_path, destination_config, overwrite=False):
-	logger.debug(f"Connecting to SMB: {smb_path}")
+SMB_CONNECTION_ERRORS = (NotConnectedError, SMBTimeout, OSError)  # Worth one reconnect; OperationFailure is not
+
+def open_smb_connection(destination_config):
+	"""Open a new SMB connection to a destination, or None if it can't connect."""
+	logger.debug(f"Connecting to SMB: {destination_config['server']}")
 	conn = SMBConnection(destination_config['username'], destination_config['password'], "videoscraper", destination_config['server'])
+	return conn if conn.connect(destination_config['server'], 445) else None
+
+def get_smb_connection(destination_config):
+	"""Return the run-wide SMB connection for a destination, connecting on first use."""
+	key = (destination_config['server'], destination_config['username'])
+	with smb_lock:
+		conn = smb_connections.get(key)
+		if conn is not None:
+			return conn
+		conn = open_smb_connection(destination_config)
+		if conn is not None:
+			smb_connections[key] = conn
+		return conn
+
+def drop_smb_connection(destination_config):
+	"""Discard a broken pooled connection so the next get_smb_connection() reconnects."""
+	with smb_lock:
+		conn = smb_connections.pop((destination_config['server'], destination_config['username']), None)
+		if conn is not None:
+			try:
+				conn.close()
+			except Exception:
+				pass
+
+def close_smb_connections():
+	"""Close every pooled SMB connection."""
+	with smb_lock:
+		for conn in smb_connections.values():
+			try:
+				conn.close()
+			except Exception:
+				pass
+		smb_connections.clear()
+		smb_listings.clear()
+
+def get_smb_listing(destination_config, directory):
+	"""Lowercased file names in an SMB directory, listed once per run and kept current as uploads land."""
+	key = (destination_config['server'], destination_config['share'], directory)
+	with smb_lock:
+		for attempt in range(2):
+			if key in smb_listings:
+				break
+			conn = get_smb_connection(destination_config)
+			if conn is None:
+				return None
+			try:
+				smb_listings[key] = {f.filename.lower() for f in conn.listPath(destination_config['share'], directory or '/')}
+			except OperationFailure as e:
+				logger.debug(f"Could not list SMB directory '{directory}': {e}")
+				smb_listings[key] = set()  # Missing directory: nothing exists there yet
+			except SMB_CONNECTION_ERRORS as e:
+				logger.debug(f"SMB connection lost while listing '{directory}' ({e}); reconnecting")
+				drop_smb_connection(destination_config)
+		return smb_listings.get(key)
+
+def upload_to_smb(local_path, smb_path, destination_config, overwrite=False):
+	"""Upload a file to the SMB share; True if it is there afterwards (uploaded or already present)."""
+	logger.debug(f"Uploading to SMB: {smb_path}")
+	if not overwrite and file_exists_on_smb(destination_config, smb_path):
+		logger.info(f"File '{smb_path}' exists on SMB share. Skipping.")
+		return True
+	
+	# The transfer gets its own connection, outside smb_lock, so other workers' existence
+	# checks on the shared connection don't queue up behind a whole upload
+	conn = None
 	try:
-		if conn.connect(destination_config['server'], 445):
-			if not overwrite and file_exists_on_smb(destination_config, smb_path):
-				logger.info(f"File '{smb_path}' exists on SMB share. Skipping.")
-				return
-			
-			file_size = os.path.getsize(local_path)
-			with open(local_path, 'rb') as file:
-				with tqdm(total=file_size, unit='B', unit_scale=True, desc="Uploading to SMB") as pbar:
-					progress_file = ProgressFile(file, pbar)
-					conn.storeFile(destination_config['share'], smb_path, progress_file)
-		else:
-			logger.error("Failed to connect to SMB share.")
+		file_size = os.path.getsize(local_path)
+		for attempt in range(2):
+			conn = open_smb_connection(destination_config)
+			if conn is None:
+				logger.error("Failed to connect to SMB share.")
+				return False
+			try:
+				with open(local_path, 'rb') as file:
+					with tqdm(total=file_size, unit='B', unit_scale=True, desc="Uploading to SMB") as pbar:
+						progress_file = ProgressFile(file, pbar)
+						conn.storeFile(destination_config['share'], smb_path, progress_file)
+				break
+			except SMB_CONNECTION_ERRORS as e:
+				conn.close()
+				conn = None
+				if attempt:
+					raise
+				logger.debug(f"SMB connection lost during upload ({e}); retrying")
 	except Exception as e:
 		logger.error(f"Error uploading to SMB: {e}")
+		return False
 	finally:
-		conn.close()
+		if conn is not None:
+			conn.close()
+	
+	with smb_lock:
+		listing = get_smb_listing(destination_config, os.path.dirname(smb_path))
+		if listing is not None:
+			listing.add(os.path.basename(smb_path).lower())
+	return True
+
 
+def load_ffprobe_cache():
+	"""Load persisted ffprobe results once per run; a missing or corrupt cache starts empty. Call with ffprobe_cache_lock held."""
+	global ffprobe_cache
+	if ffprobe_cache is None:
+		try:
+			with open(FFPROBE_CACHE_FILE, 'r', encoding='utf-8') as f:
+				ffprobe_cache = json.load(f)
+		except (OSError, ValueError):
+			ffprobe_cache = {}
+		atexit.register(save_ffprobe_cache)
+	return ffprobe_cache
+
+def ffprobe_cache_key(file_path, st):
+	"""Cache key tying a probe result to one version of one file."""
+	return f"{os.path.abspath(file_path)}|{st.st_mtime_ns}|{st.st_size}"
+
+def save_ffprobe_cache():
+	"""Write new ffprobe results back once per run, dropping entries for files that moved or changed."""
+	global ffprobe_cache_dirty
+	with ffprobe_cache_lock:
+		if not ffprobe_cache_dirty:
+			return
+		live = {}
+		for key, video_info in ffprobe_cache.items():
+			path, _, _ = key.rsplit('|', 2)
+			try:
+				if ffprobe_cache_key(path, os.stat(path)) == key:
+					live[key] = video_info
+			except OSError:
+				pass  # Uploaded, moved away or deleted
+		live = dict(list(live.items())[-FFPROBE_CACHE_MAX:])
+		temp_path = None
+		try:
+			cache_dir = os.path.dirname(FFPROBE_CACHE_FILE)
+			os.makedirs(cache_dir, exist_ok=True)
+			fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix='ffprobe.', suffix='.tmp')
+			with os.fdopen(fd, 'w', encoding='utf-8') as f:
+				json.dump(live, f)
+			os.replace(temp_path, FFPROBE_CACHE_FILE)  # Atomic, so an interrupted write can't leave it half-written
+			ffprobe_cache_dirty = False
+		except Exception as e:
+			logger.debug(f"Failed to save ffprobe cache: {e}")
+			if temp_path and os.path.exists(temp_path):
+				os.remove(temp_path)
+
+def remember_video_metadata(file_path, video_info):
+	"""Cache a probe result for a file at its final path."""
+	global ffprobe_cache_dirty
+	try:
+		st = os.stat(file_path)
+	except OSError:
+		return
+	with ffprobe_cache_lock:
+		load_ffprobe_cache()[ffprobe_cache_key(file_path, st)] = video_info
+		ffprobe_cache_dirty = True
 
 def get_video_metadata(file_path):
+	"""Return probe_video_metadata results, cached by path, mtime and size across runs."""
+	try:
+		st = os.stat(file_path)
+	except OSError as e:
+		logger.error(f"Error extracting metadata for {file_path}: {e}")
+		return None
+	with ffprobe_cache_lock:
+		video_info = load_ffprobe_cache().get(ffprobe_cache_key(file_path, st))
+	if video_info is not None:
+		return video_info
+	video_info = probe_video_metadata(file_path)
+	if video_info is not None:
+		remember_video_metadata(file_path, video_info)
+	return video_info
+
+def probe_video_metadata(file_path):
 	"""Extract video duration, resolution, and bitrate using ffprobe, with sanity check."""
 	command = [
 		"ffprobe",
 		"-v", "error",
+		"-select_streams", "v:0",  # Only the first video stream's width/height is used
 		"-show_entries", "format=duration,bit_rate,size:stream=width,height",
 		"-of", "json",
 		file_path
@@ -1379,6 +2069,9 @@ def download_file(url, destination_path, method, general_config, site_config, he
 	
 	use_headers = headers and any(k in headers for k in ["Cookie"])
 	success = False
+	# Pick the User-Agent once so a fallback downloader presents the same browser as the first attempt
+	headers = dict(headers or {})
+	headers.setdefault('User-Agent', random.choice(general_config['user_agents']))
 	
 	desc = f"Downloading {os.path.basename(destination_path)}"
 	temp_path = os.path.join(os.path.dirname(destination_path), f".{os.path.basename(destination_path)}")  # Changed from .part suffix to . prefix
@@ -1386,10 +2079,17 @@ def download_file(url, destination_path, method, general_config, site_config, he
 	try:
 		if method == "requests":
 			success = download_with_requests(url, temp_path, headers, general_config, site_config, desc)
-		elif method == 'curl':
-			success = download_with_curl(url, temp_path, headers, general_config, site_config, desc)
-		elif method == 'wget':
-			success = download_with_wget(url, temp_path, headers, general_config, site_config, desc)
+		elif method in ('curl', 'wget'):
+			# Plain HTTP fetches stream in-process over the pooled session; the external tool
+			# (a fork/exec and fresh TLS handshake per file) is kept only as a fallback
+			try:
+				success = download_with_requests(url, temp_path, headers, general_config, site_config, desc)
+			except Exception as e:
+				logger.warning(f"In-process download failed ({e}); retrying with {method}")
+				success = False
+			if not success and not stop_event.is_set():
+				downloader = download_with_curl if method == 'curl' else download_with_wget
+				success = downloader(url, temp_path, headers, general_config, site_config, desc)
 		elif method == 'yt-dlp':
 			success = download_with_ytdlp(url, temp_path, headers, general_config, metadata, desc, overwrite=overwrite)
 		elif method == 'ffmpeg':
@@ -1401,9 +2101,11 @@ def download_file(url, destination_path, method, general_config, site_config, he
 		return False
 	
 	if success and os.path.exists(temp_path):
-		video_info = get_video_metadata(temp_path)
+		# Probe the temp file uncached: it is renamed straight away, so cache under the final path instead
+		video_info = probe_video_metadata(temp_path)
 		if video_info:
 			os.rename(temp_path, destination_path)  # Rename only if valid
+			remember_video_metadata(destination_path, video_info)
 			logger.debug(f"Download completed: {os.path.basename(destination_path)}")
 			logger.info(f"Size: {video_info['size_str']} · Duration: {video_info['duration']} · Resolution: {video_info['resolution']}")
 			return True
@@ -1425,20 +2127,22 @@ def download_with_requests(url, destination_path, headers, general_config, site_
 	
 	logger.debug(f"Executing requests GET: {url} with headers: {headers}")
 	
-	with requests.get(url, headers=headers, stream=True) as r:
+	with session.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as r:
 		r.raise_for_status()
 		total_size = int(r.headers.get("Content-Length", 0)) or None
 		if not total_size:
 			logger.debug("Content-Length unavailable; total size will be determined at completion.")
 		
 		os.makedirs(os.path.dirname(destination_path), exist_ok=True)
-		with open(destination_path, "wb") as f:
+		with open(destination_path, "wb", buffering=DOWNLOAD_WRITE_BUFFER) as f:
+			if hasattr(os, 'posix_fadvise'):
+				os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
 			with tqdm(total=total_size, unit="B", unit_scale=True, desc=desc, disable=False) as pbar:
-				for chunk in r.iter_content(chunk_size=1024):
-					size = f.write(chunk)
-					pbar.update(size)
-					if not total_size:
-						pbar.total = pbar.n
+				# Copy straight from the raw stream in 256 KiB reads; ProgressFile feeds the bar
+				r.raw.decode_content = True
+				shutil.copyfileobj(ProgressFile(r.raw, pbar, stop_event), f, length=DOWNLOAD_CHUNK_SIZE)
+				if not total_size:
+					pbar.total = pbar.n
 	
 	if os.path.exists(destination_path):
 		final_size = os.path.getsize(destination_path)
@@ -1465,13 +2169,8 @@ def download_with_curl(url, destination_path, headers, general_config, site_conf
 	logger.debug(f"Executing curl command: {' '.join(shlex.quote(arg) for arg in command)}")
 	
 	# Pipe curl output directly to terminal
-	process = subprocess.Popen(
-		command,
-		stdout=sys.stdout,  # Real-time output to terminal
-		stderr=subprocess.STDOUT,
-		universal_newlines=True,
-		bufsize=1  # Line buffering for live updates
-	)
+	# curl writes straight to our terminal; no pipe, so no buffering or text decoding on our side
+	process = subprocess.Popen(command, stdout=sys.stdout, stderr=subprocess.STDOUT)
 	
 	return_code = process.wait()
 	if return_code != 0:
@@ -1493,24 +2192,23 @@ def download_with_wget(url, destination_path, headers, general_config, site_conf
 	command.append(url)
 	
 	logger.debug(f"Executing wget command: {' '.join(shlex.quote(arg) for arg in command)}")
-	process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+	process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=1 << 16)
 	
-	total_size = get_content_length(url, headers, general_config)
-	progress_regex = re.compile(r'(\d+)%\s+(\d+[KMG]?)')
-	with tqdm(total=total_size, unit='B', unit_scale=True, desc=desc, disable=not total_size) as pbar:
+	# wget reports the size itself ("Length: N"), so no separate HEAD request or per-line stat()
+	total_size = None
+	with tqdm(total=None, unit='B', unit_scale=True, desc=desc) as pbar:
 		for line in process.stdout:
-			match = progress_regex.search(line)
+			match = WGET_PROGRESS_RE.search(line)
 			if match:
-				percent, _ = match.groups()
 				if total_size:
-					pbar.update((int(percent) * total_size // 100) - pbar.n)
-			elif "Length:" in line and total_size is None:
-				size = int(re.search(r'Length: (\d+)', line).group(1))
-				pbar.total = size
+					pbar.update((int(match.group(1)) * total_size // 100) - pbar.n)
+			elif b"Length:" in line and total_size is None:
+				length = WGET_LENGTH_RE.search(line)
+				if length:
+					total_size = int(length.group(1))
+					pbar.total = total_size
 			elif line.strip():
-				logger.debug(f"wget output: {line.strip()}")
-			if os.path.exists(destination_path):
-				pbar.update(os.path.getsize(destination_path) - pbar.n)
+				logger.debug(f"wget output: {line.strip().decode('utf-8', 'replace')}")
 	
 	return_code = process.wait()
 	if return_code != 0:
@@ -1520,7 +2218,64 @@ def download_with_wget(url, destination_path, headers, general_config, site_conf
 	return True
 
 
+def make_ytdlp_progress_hook(pbar, downloaded_files=None):
+	"""Build a yt-dlp progress hook that drives a tqdm bar from the status dicts it reports."""
+	current = {'filename': None}
+	
+	def hook(d):
+		filename = d.get('filename')
+		if filename and filename != current['filename']:
+			# Separate video/audio formats each report progress from zero
+			current['filename'] = filename
+			pbar.reset(total=d.get('total_bytes') or d.get('total_bytes_estimate'))
+			if downloaded_files is not None and os.path.basename(filename) not in downloaded_files:
+				downloaded_files.append(os.path.basename(filename))
+		if d['status'] == 'downloading':
+			total = d.get('total_bytes') or d.get('total_bytes_estimate')
+			if total and pbar.total != total:
+				pbar.total = total
+			pbar.update(d.get('downloaded_bytes', 0) - pbar.n)
+	
+	return hook
+
+
 def download_with_ytdlp(url, destination_path, headers, general_config, metadata, desc, overwrite=False):
+	if not YTDLP_AVAILABLE:
+		return download_with_ytdlp_cli(url, destination_path, headers, general_config, metadata, desc, overwrite)
+	ua = headers.get('User-Agent', random.choice(general_config['user_agents']))
+	with tqdm(unit='B', unit_scale=True, desc=desc) as pbar:
+		opts = {
+			'outtmpl': destination_path,
+			'http_headers': {'User-Agent': ua},
+			'progress_hooks': [make_ytdlp_progress_hook(pbar)],
+			'quiet': True,
+			'noprogress': True,
+		}
+		if overwrite:
+			opts['overwrites'] = True  # Unset otherwise, matching the CLI default
+		if metadata and 'Image' in metadata:
+			opts['writethumbnail'] = True
+			opts['postprocessors'] = [
+				{'key': 'FFmpegThumbnailsConvertor', 'format': 'jpg', 'when': 'before_dl'},
+				{'key': 'EmbedThumbnail'},
+			]
+		
+		logger.debug(f"Running yt-dlp for {url} -> {destination_path}")
+		try:
+			with YoutubeDL(opts) as ydl:
+				return_code = ydl.download([url])
+		except DownloadError as e:
+			logger.error(f"yt-dlp failed: {e}")
+			return False
+	
+	if return_code != 0:
+		logger.error(f"yt-dlp failed with return code {return_code}")
+		return False
+	logger.debug(f"Successfully completed yt-dlp download to {destination_path}")
+	return True
+
+def download_with_ytdlp_cli(url, destination_path, headers, general_config, metadata, desc, overwrite=False):
+	"""Run the yt-dlp command-line tool when the yt_dlp package isn't importable."""
 	ua = headers.get('User-Agent', random.choice(general_config['user_agents']))
 	command = ["yt-dlp", "-o", destination_path, "--user-agent", ua, "--progress"]
 	if overwrite:
@@ -1530,13 +2285,12 @@ def download_with_ytdlp(url, destination_path, headers, general_config, metadata
 	command.append(url)
 	
 	logger.debug(f"Executing yt-dlp command: {' '.join(shlex.quote(arg) for arg in command)}")
-	process = subprocess.Popen(
-		command,
-		stdout=sys.stdout,  # Direct yt-dlp progress to terminal
-		stderr=subprocess.STDOUT,  # Errors with stdout
-		universal_newlines=True,
-		bufsize=1  # Line buffering for real-time output
-	)
+	# yt-dlp progress goes straight to our terminal, errors included
+	try:
+		process = subprocess.Popen(command, stdout=sys.stdout, stderr=subprocess.STDOUT)
+	except OSError as e:
+		logger.error(f"yt-dlp is not available as a Python package or command: {e}")
+		return False
 	
 	return_code = process.wait()
 	if return_code != 0:
@@ -1545,7 +2299,6 @@ def download_with_ytdlp(url, destination_path, headers, general_config, metadata
 	logger.debug(f"Successfully completed yt-dlp download to {destination_path}")
 	return True
 	
-	
 def download_with_ffmpeg(url, destination_path, general_config, headers=None, desc="Downloading", origin=None):
 	headers = headers or {}
 	ua = headers.get('User-Agent', random.choice(general_config['user_agents']))
@@ -1570,8 +2323,7 @@ def download_with_ffmpeg(url, destination_path, general_config, headers=None, de
 	
 	logger.debug(f"Fetching M3U8 with headers: {fetch_headers}")
 	try:
-		scraper = cloudscraper.create_scraper()
-		response = scraper.get(url, headers=fetch_headers, timeout=30)
+		response = get_cloud_scraper(url).get(url, headers=fetch_headers, timeout=30)
 		response.raise_for_status()
 		m3u8_content = response.text
 		logger.debug(f"Fetched M3U8 content: {m3u8_content[:100]}...")
@@ -1580,28 +2332,37 @@ def download_with_ffmpeg(url, destination_path, general_config, headers=None, de
 		return False
 	
 	temp_m3u8_path = destination_path + ".m3u8"
+	base_url = url.rsplit('/', 1)[0] + "/"
+	total_segments = 0
+	
+	def absolutize(match):
+		nonlocal total_segments
+		total_segments += 1
+		segment = match.group(0)
+		return segment if segment.startswith("http") else urllib.parse.urljoin(base_url, segment)
+	
+	# One regex pass over the URI lines instead of a Python loop over every playlist line
 	with open(temp_m3u8_path, "w", encoding="utf-8") as f:
-		base_url = url.rsplit('/', 1)[0] + "/"
-		segments = []
-		for line in m3u8_content.splitlines():
-			if line and not line.startswith("#"):
-				if not line.startswith("http"):
-					line = urllib.parse.urljoin(base_url, line)
-				segments.append(line)
-				f.write(line + "\n")
-			else:
-				f.write(line + "\n")
+		f.write(M3U8_URI_LINE_RE.sub(absolutize, m3u8_content))
 	
-	total_segments = len(segments)
-	logger.debug(f"Found {total_segments} segments in M3U8")
+	total_duration = sum(float(d) for d in M3U8_EXTINF_RE.findall(m3u8_content))
+	logger.debug(f"Found {total_segments} segments ({total_duration:.0f}s) in M3U8")
 	
 	command = [
 		"ffmpeg",
 		"-protocol_whitelist", "file,http,https,tcp,tls,crypto",
+		# HLS demuxer: keep segment connections alive and request the next segment while the
+		# current one is still downloading, instead of one fresh request per segment in series
+		"-http_persistent", "1",
+		"-http_multiple", "1",
 		"-i", temp_m3u8_path,
 		"-c", "copy",
 		"-bsf:a", "aac_adtstoasc",
 		"-y",
+		# Machine-readable key=value progress on stdout instead of scraping the human log
+		"-progress", "pipe:1",
+		"-nostats",
+		"-loglevel", "error",
 		destination_path
 	]
 	
@@ -1613,18 +2374,30 @@ def download_with_ffmpeg(url, destination_path, general_config, headers=None, de
 		universal_newlines=True
 	)
 	
-	desc = f"Downloading {os.path.basename(destination_path)}"
-	with tqdm(total=total_segments, unit='seg', desc=desc) as pbar:
+	def log_errors():
 		for line in process.stderr:
 			line = line.strip()
-			if "Opening 'http" in line and '.ts' in line:
-				pbar.update(1)
-			elif "error" in line.lower() or "failed" in line.lower():
+			if line:
 				logger.error(f"FFmpeg error: {line}")
-			elif "Duration:" in line:
-				logger.debug(f"FFmpeg output: {line}")
+	
+	# Drain stderr on its own thread so a chatty failure can't block the progress pipe
+	error_thread = threading.Thread(target=log_errors, daemon=True)
+	error_thread.start()
+	
+	desc = f"Downloading {os.path.basename(destination_path)}"
+	with tqdm(total=round(total_duration, 1) or None, unit='s', desc=desc) as pbar:
+		for line in process.stdout:
+			key, _, value = line.strip().partition('=')
+			# out_time_ms is in microseconds despite its name; newer builds also emit out_time_us
+			if key in ('out_time_us', 'out_time_ms') and value.isdigit():
+				position = round(int(value) / 1_000_000, 1)
+				if position > pbar.n:
+					pbar.update(position - pbar.n)
+			elif key == 'progress' and value == 'end':
+				break
 	
 	return_code = process.wait()
+	error_thread.join()
 	if os.path.exists(temp_m3u8_path):
 		os.remove(temp_m3u8_path)
 	
@@ -1635,37 +2408,15 @@ def download_with_ffmpeg(url, destination_path, general_config, headers=None, de
 	return True
 	
 
-def get_content_length(url, headers, general_config):
-	"""Attempt to fetch Content-Length header for progress bar accuracy."""
-	try:
-		ua = headers.get('User-Agent', random.choice(general_config['user_agents']))
-		fetch_headers = {"User-Agent": ua}
-		if "Referer" in headers:
-			fetch_headers["Referer"] = headers["Referer"]
-		if "Cookie" in headers:
-			fetch_headers["Cookie"] = headers["Cookie"]
-		response = requests.head(url, headers=fetch_headers, timeout=10, allow_redirects=True)
-		response.raise_for_status()
-		return int(response.headers.get("Content-Length", 0)) or None
-	except Exception as e:
-		logger.debug(f"Failed to get Content-Length: {e}")
-		return None
-
 def file_exists_on_smb(destination_config, path):
-	# logger.debug("Connecting to SMB...")
-	conn = SMBConnection(destination_config['username'], destination_config['password'], "videoscraper", destination_config['server'])
-	try:
-		if conn.connect(destination_config['server'], 445):
-			logger.debug(f"Successfully connected to SMB")
-			try:
-				conn.getAttributes(destination_config['share'], path)
-				return True
-			except:
-				return False
-		logger.debug(f"File not on SMB")
+	"""Check the cached directory listing instead of a connect + getAttributes round-trip per file."""
+	listing = get_smb_listing(destination_config, os.path.dirname(path))
+	if listing is None:
 		return False
-	finally:
-		conn.close()
+	if os.path.basename(path).lower() in listing:  # SMB names are case-insensitive
+		return True
+	logger.debug(f"File not on SMB")
+	return False
 
 def handle_vpn(general_config, action='start'):
 	global last_vpn_action_time
@@ -1675,10 +2426,14 @@ def handle_vpn(general_config, action='start'):
 	vpn_bin = vpn_config.get('vpn_bin', '')
 	cmd = vpn_config.get(f"{action}_cmd", '').format(vpn_bin=vpn_bin)
 	try:
-		subprocess.run(cmd, shell=True, check=True)
-		last_vpn_action_time = time.time()
+		if not cmd.strip() or SHELL_METACHARS_RE.search(cmd):
+			subprocess.run(cmd, shell=True, check=True)  # Pipes, redirects, ~, env prefixes, etc. need a real shell
+		else:
+			subprocess.run(shlex.split(cmd), check=True)
+		last_vpn_action_time = time.monotonic()
 		logger.info(f"VPN {action} executed")
-	except subprocess.CalledProcessError as e:
+	except (subprocess.CalledProcessError, OSError) as e:
+		# OSError: a missing or non-executable binary, which the shell used to report as exit 127/126
 		logger.error(f"Failed VPN {action}: {e}")
 
 def process_fallback_download(url, general_config, overwrite=False):
@@ -1691,11 +2446,15 @@ def process_fallback_download(url, general_config, overwrite=False):
 		shutil.rmtree(temp_dir, ignore_errors=True)
 		return False
 	
+	existing_names = set()
+	if destination_config['type'] == 'smb' and not overwrite:
+		# One listing of the destination directory answers the check for every downloaded file
+		existing_names = get_smb_listing(destination_config, destination_config['path']) or set()
 	for downloaded_file in downloaded_files:
 		source_path = os.path.join(temp_dir, downloaded_file)
 		if destination_config['type'] == 'smb':
 			smb_destination_path = os.path.join(destination_config['path'], downloaded_file)
-			if not overwrite and file_exists_on_smb(destination_config, smb_destination_path):
+			if not overwrite and downloaded_file.lower() in existing_names:
 				logger.info(f"File '{downloaded_file}' exists on SMB. Skipping.")
 				continue
 			upload_to_smb(source_path, smb_destination_path, destination_config)
@@ -1705,30 +2464,62 @@ def process_fallback_download(url, general_config, overwrite=False):
 				logger.info(f"File '{downloaded_file}' exists locally. Skipping.")
 				continue
 			os.makedirs(os.path.dirname(final_path), exist_ok=True)
-			shutil.move(source_path, final_path)
+			move_file(source_path, final_path)
 			apply_permissions(final_path, destination_config)
 	shutil.rmtree(temp_dir, ignore_errors=True)
 	return True
 
 def download_with_ytdlp_fallback(url, temp_dir, general_config):
-	command = f"yt-dlp --paths {temp_dir} --format best --add-metadata"
+	if not YTDLP_AVAILABLE:
+		return download_with_ytdlp_fallback_cli(url, temp_dir, general_config)
+	downloaded_files = []
+	with tqdm(unit='B', unit_scale=True, desc="Downloading") as pbar:
+		opts = {
+			'paths': {'home': temp_dir},
+			'format': 'best',
+			'postprocessors': [{'key': 'FFmpegMetadata', 'add_metadata': True}],
+			'progress_hooks': [make_ytdlp_progress_hook(pbar, downloaded_files)],
+			'quiet': True,
+			'noprogress': True,
+		}
+		if general_config.get('user_agents'):
+			opts['http_headers'] = {'User-Agent': random.choice(general_config['user_agents'])}
+		try:
+			with YoutubeDL(opts) as ydl:
+				success = ydl.download([url]) == 0
+		except DownloadError as e:
+			logger.error(f"yt-dlp failed: {e}")
+			success = False
+		except KeyboardInterrupt:
+			return False, []
+	if success and not downloaded_files:
+		downloaded_files = os.listdir(temp_dir)
+	return success and downloaded_files, downloaded_files
+
+
+def download_with_ytdlp_fallback_cli(url, temp_dir, general_config):
+	"""Command-line counterpart of download_with_ytdlp_fallback, scraping filenames and progress from its output."""
+	command = ["yt-dlp", "--paths", temp_dir, "--format", "best", "--add-metadata"]
 	if general_config.get('user_agents'):
-		command += f" --user-agent \"{random.choice(general_config['user_agents'])}\""
-	command += f" \"{url}\""
-	process = subprocess.Popen(command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, cwd=temp_dir)
-	progress_regex = re.compile(r'\[download\]\s+(\d+\.\d+)% of ~?\s*(\d+\.\d+)(K|M|G)iB')
-	filename_regex = re.compile(r'\[download\] Destination: (.+)')
+		command.extend(["--user-agent", random.choice(general_config['user_agents'])])
+	command.append(url)
+	# argv list instead of a shell string: no /bin/sh per download and no quoting of the URL
+	try:
+		process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, bufsize=1 << 16, cwd=temp_dir)
+	except OSError as e:
+		logger.error(f"yt-dlp is not available as a Python package or command: {e}")
+		return False, []
 	downloaded_files = []
 	total_size = None
 	pbar = None
 	try:
 		for line in process.stdout:
-			filename_match = filename_regex.search(line)
+			filename_match = YTDLP_DESTINATION_RE.search(line)
 			if filename_match:
 				filename = os.path.basename(filename_match.group(1))
 				if filename not in downloaded_files:
 					downloaded_files.append(filename)
-			progress_match = progress_regex.search(line)
+			progress_match = YTDLP_PROGRESS_RE.search(line)
 			if progress_match:
 				percent, size, size_unit = progress_match.groups()
 				if total_size is None:
@@ -1752,70 +2543,43 @@ def download_with_ytdlp_fallback(url, temp_dir, general_config):
 
 
 def parse_url_pattern(pattern):
+	"""Split a URL pattern into static and {wildcard} components in one regex scan."""
 	components = []
-	current_segment = ""
-	
-	i = 0
-	while i < len(pattern):
-		if pattern[i] == "{":
-			if current_segment:
-				components.append({"type": "static", "value": current_segment})
-				current_segment = ""
-			j = i + 1
-			while j < len(pattern) and pattern[j] != "}":
-				j += 1
-			if j < len(pattern):
-				placeholder = pattern[i+1:j]
-				components.append({"type": "wildcard", "name": placeholder, "numeric": placeholder == "page"})
-				i = j + 1
-			else:
-				raise ValueError(f"Unclosed placeholder in pattern: {pattern}")
+	position = 0
+	for match in URL_PATTERN_TOKEN_RE.finditer(pattern):
+		if match.start() != position:
+			break
+		placeholder, static = match.groups()
+		if static is not None:
+			components.append({"type": "static", "value": static})
 		else:
-			current_segment += pattern[i]
-			i += 1
-	
-	if current_segment:
-		components.append({"type": "static", "value": current_segment})
-	
-	logger.debug(f"Parsed pattern '{pattern}' into components: {components}")
+			components.append({"type": "wildcard", "name": placeholder, "numeric": placeholder == "page"})
+		position = match.end()
+	if position != len(pattern):
+		raise ValueError(f"Unclosed placeholder in pattern: {pattern}")
 	return components
 
 
+@functools.lru_cache(maxsize=None)
 def pattern_to_regex(pattern):
-	regex = ""
+	"""Compiled, case-insensitive regex for a URL pattern; patterns are static, so compile each only once per run."""
+	regex, static_count, static_length = pattern_to_regex_source(pattern)
+	return re.compile(regex, re.IGNORECASE), static_count, static_length
+
+def pattern_to_regex_source(pattern, named_groups=True):
+	"""Regex source plus static segment count/length for a URL pattern; unnamed groups allow combining patterns."""
+	parts = []
 	static_count = 0
 	static_length = 0
-	in_wildcard = False
-	current_static = ""
-	numeric_wildcards = {"page"}
-	
-	for char in pattern.rstrip("/"):
-		if char == "{":
-			if current_static:
-				regex += re.escape(current_static)
-				static_count += 1
-				static_length += len(current_static)
-				current_static = ""
-			in_wildcard = True
-			wildcard_name = ""
-		elif char == "}":
-			if in_wildcard:
-				if wildcard_name in numeric_wildcards:
-					regex += f"(?P<{wildcard_name}>\\d+)"
-				else:
-					regex += f"(?P<{wildcard_name}>[^/?&#]+)"
-				in_wildcard = False
-			else:
-				current_static += char
-		elif in_wildcard:
-			wildcard_name += char
+	for component in parse_url_pattern(pattern.rstrip("/")):
+		if component["type"] == "static":
+			parts.append(re.escape(component["value"]))
+			static_count += 1
+			static_length += len(component["value"])
 		else:
-			current_static += char
-	
-	if current_static:
-		regex += re.escape(current_static)
-		static_count += 1
-		static_length += len(current_static)
+			group = f"?P<{component['name']}>" if named_groups else "?:"
+			parts.append(f"({group}\\d+)" if component["numeric"] else f"({group}[^/?&#]+)")
+	regex = "".join(parts)
 	
 	if "?" not in pattern and "&" not in pattern:
 		regex = f"^{regex}$"
@@ -1823,50 +2587,52 @@ def pattern_to_regex(pattern):
 		regex = f"^{regex}(?:$|&.*)"
 	
 	# logger.debug(f"Converted pattern '{pattern}' to regex: '{regex}', static_count={static_count}, static_length={static_length}")
-	return re.compile(regex, re.IGNORECASE), static_count, static_length  # Add IGNORECASE
+	return regex, static_count, static_length
+
+def compile_site_matcher(site_config):
+	"""Combine every non-video mode pattern into one alternation, cached on the site config.
+	
+	Alternatives are ordered most-specific first (static_count, then static_length), so the
+	branch the regex engine picks is the one the per-pattern loop used to select.
+	"""
+	if '_compiled_matcher' in site_config:
+		return site_config['_compiled_matcher']
+	candidates = []
+	for mode, config in site_config.get("modes", {}).items():
+		if mode == "video":
+			continue
+		for pattern_key in ["url_pattern", "url_pattern_pages"]:
+			if pattern_key in config:
+				regex, static_count, static_length = pattern_to_regex_source(config[pattern_key], named_groups=False)
+				candidates.append((static_count, static_length, regex, mode, config["scraper"]))
+	candidates.sort(key=lambda c: (c[0], c[1]), reverse=True)  # Stable: ties keep config order
+	meta_by_group = {}
+	fragments = []
+	for i, (static_count, static_length, regex, mode, scraper) in enumerate(candidates):
+		meta_by_group[f"_m{i}"] = (mode, scraper, static_count, static_length)
+		fragments.append(f"(?P<_m{i}>{regex})")
+	compiled = re.compile("|".join(fragments), re.IGNORECASE) if fragments else None
+	site_config['_compiled_matcher'] = (compiled, meta_by_group)
+	return site_config['_compiled_matcher']
 
 def match_url_to_mode(url, site_config):
-	parsed_url = urlparse(url)
+	parsed_url = cached_urlparse(url)
 	netloc = parsed_url.netloc.lower().replace("www.", "", 1)
 	full_path = parsed_url.path.rstrip("/").lower() + ("?" + parsed_url.query.lower() if parsed_url.query else "")
 	
-	base_netloc = urlparse(site_config["base_url"]).netloc.lower().replace("www.", "", 1)
+	base_netloc = cached_urlparse(site_config["base_url"]).netloc.lower().replace("www.", "", 1)
 	if netloc != base_netloc:
 		# logger.debug(f"No match: netloc '{netloc}' != base_netloc '{base_netloc}'")
 		return None, None
 	
-	modes = site_config.get("modes", {})
-	non_video_modes = {k: v for k, v in modes.items() if k != "video"}
-	video_mode = modes.get("video")
-	
-	best_match = None
-	best_static_count = -1
-	best_static_length = -1
-	
-	for mode, config in non_video_modes.items():
-		# logger.debug(f"Checking mode: '{mode}'")
-		for pattern_key in ["url_pattern", "url_pattern_pages"]:
-			if pattern_key not in config:
-				continue
-			pattern = config[pattern_key]
-			regex, static_count, static_length = pattern_to_regex(pattern)
-			# logger.debug(f"Testing pattern '{pattern}' -> regex '{regex.pattern}'")
-			match = regex.match(full_path)
-			if match:
-				extracted = match.groupdict()
-				# logger.debug(f"Match found: extracted={extracted}")
-				if (static_count > best_static_count) or (static_count == best_static_count and static_length > best_static_length):
-					best_match = (mode, config["scraper"])
-					best_static_count = static_count
-					best_static_length = static_length
-				# logger.debug(f"Matched URL '{url}' to mode '{mode}' with {pattern_key} (static_count={static_count}, static_length={static_length})")
-			#else:
-				# logger.debug(f"No match for '{pattern}'")
-	
-	if best_match:
-		logger.debug(f"Best match selected: {best_match} (static_count={best_static_count}, static_length={best_static_length})")
-		return best_match
+	compiled, meta_by_group = compile_site_matcher(site_config)
+	match = compiled.match(full_path) if compiled else None
+	if match:
+		mode, scraper, static_count, static_length = meta_by_group[match.lastgroup]
+		logger.debug(f"Best match selected: {(mode, scraper)} (static_count={static_count}, static_length={static_length})")
+		return mode, scraper
 	
+	video_mode = site_config.get("modes", {}).get("video")
 	if video_mode and "url_pattern" in video_mode:
 		pattern = video_mode["url_pattern"]
 		regex, static_count, static_length = pattern_to_regex(pattern)
@@ -1900,18 +2666,30 @@ def has_metadata_selectors(site_config, return_fields=False):
 	return bool(metadata_fields)
 
 
-def custom_title_case(text, uppercase_list=None, preserve_mixed_case=False):
-	"""Apply custom title casing with exact match overrides from uppercase_list."""
+def build_override_map(uppercase_list):
+	"""Case-insensitive mapping of case overrides to their exact form (e.g. "brutalx" -> "BrutalX")."""
+	return {term.lower(): term for term in uppercase_list or []}
+
+def get_override_maps(general_config):
+	"""Override maps for names and for tags, built once per run from general_config."""
+	if '_override_maps' not in general_config:
+		case_overrides = general_config.get('case_overrides', [])
+		tag_case_overrides = general_config.get('tag_case_overrides', [])
+		general_config['_override_maps'] = (
+			build_override_map(case_overrides),
+			build_override_map(case_overrides + tag_case_overrides),  # Combine for tags
+		)
+	return general_config['_override_maps']
+
+def custom_title_case(text, override_map=None, preserve_mixed_case=False):
+	"""Apply custom title casing with exact match overrides from a build_override_map() mapping."""
 	if not text:
 		return text
-	uppercase_list = uppercase_list or []
-	# If preserving mixed case (e.g., "McFly") and not in uppercase_list, return as-is
-	if preserve_mixed_case and re.search(r'[a-z][A-Z]|[A-Z][a-z]', text) and text.lower() not in {u.lower() for u in uppercase_list}:
+	override_map = override_map or {}
+	# If preserving mixed case (e.g., "McFly") and not an override, return as-is
+	if preserve_mixed_case and MIXED_CASE_RE.search(text) and text.lower() not in override_map:
 		return text
 	
-	# Build a case-insensitive mapping of overrides to their exact form
-	override_map = {term.lower(): term for term in uppercase_list}
-	
 	# Split into words
 	words = text.split()
 	if not words:
@@ -1933,22 +2711,30 @@ def custom_title_case(text, uppercase_list=None, preserve_mixed_case=False):
 	
 def finalize_metadata(metadata, general_config):
 	"""Finalize metadata: deduplicate across fields, apply capitalization rules."""
-	case_overrides = general_config.get('case_overrides', [])
-	tag_case_overrides = general_config.get('tag_case_overrides', [])
-	tag_overrides = case_overrides + tag_case_overrides  # Combine for tags
+	case_overrides, tag_overrides = get_override_maps(general_config)
 	
 	final_metadata = metadata.copy()
 	
-	# Normalize fields to lists and strip '#'
-	actors = [actor.lstrip('#') for actor in final_metadata.get('actors', []) if actor]
-	studios = [studio.lstrip('#') for studio in final_metadata.get('studios', []) if studio]
-	tags = [tag.lstrip('#') for tag in final_metadata.get('tags', []) if tag]
-	
-	# Deduplicate: Actors > Studios > Tags
-	actors_lower = set(a.lower() for a in actors)
-	studios = [s for s in studios if s.lower() not in actors_lower]
-	studios_lower = set(s.lower() for s in studios)
-	tags = [t for t in tags if t.lower() not in actors_lower and t.lower() not in studios_lower]
+	# Strip '#', drop empties and deduplicate (Actors > Studios > Tags) in one pass per field,
+	# lowercasing each name only once
+	actors, actors_lower = [], set()
+	for actor in final_metadata.get('actors', []):
+		actor = actor.lstrip('#') if actor else ''
+		if actor:
+			actors.append(actor)
+			actors_lower.add(actor.lower())
+	studios, taken_lower = [], set(actors_lower)
+	for studio in final_metadata.get('studios', []):
+		studio = studio.lstrip('#') if studio else ''
+		studio_lower = studio.lower()
+		if studio and studio_lower not in actors_lower:
+			studios.append(studio)
+			taken_lower.add(studio_lower)
+	tags = []
+	for tag in final_metadata.get('tags', []):
+		tag = tag.lstrip('#') if tag else ''
+		if tag and tag.lower() not in taken_lower:
+			tags.append(tag)
 	
 	# Apply capitalization
 	final_metadata['actors'] = [custom_title_case(a, case_overrides, preserve_mixed_case=True) for a in actors]
@@ -1982,34 +2768,35 @@ def generate_nfo(destination_path, metadata, overwrite=False):
 		return True
 
 	try:
-		# Write the NFO file
+		# Build the whole document, escaping scraped values, then write it in one call
+		parts = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n', '<movie>\n']
+		if 'title' in metadata and metadata['title']:
+			parts.append(f"  <title>{xml_escape(str(metadata['title']))}</title>\n")
+		if 'URL' in metadata and metadata['URL']:
+			parts.append(f"  <url>{xml_escape(str(metadata['URL']))}</url>\n")
+		if 'date' in metadata and metadata['date']:
+			parts.append(f"  <premiered>{xml_escape(str(metadata['date']))}</premiered>\n")
+		if 'Code' in metadata and metadata['Code']:
+			parts.append(f"  <uniqueid>{xml_escape(str(metadata['Code']))}</uniqueid>\n")
+		if 'tags' in metadata and metadata['tags']:
+			parts.extend(f"  <tag>{xml_escape(tag)}</tag>\n" for tag in metadata['tags'])
+		if 'actors' in metadata and metadata['actors']:
+			parts.extend(
+				f"  <actor>\n    <name>{xml_escape(performer)}</name>\n    <order>{i}</order>\n  </actor>\n"
+				for i, performer in enumerate(metadata['actors'], 1)
+			)
+		if 'Image' in metadata and metadata['Image']:
+			parts.append(f"  <thumb aspect=\"poster\">{xml_escape(str(metadata['Image']))}</thumb>\n")
+		if 'studios' in metadata and metadata['studios']:
+			parts.extend(f"  <studio>{xml_escape(studio)}</studio>\n" for studio in metadata['studios'])
+		elif 'studio' in metadata and metadata['studio']:
+			parts.append(f"  <studio>{xml_escape(str(metadata['studio']))}</studio>\n")
+		if 'description' in metadata and metadata['description']:
+			parts.append(f"  <plot>{xml_escape(str(metadata['description']))}</plot>\n")
+		parts.append('</movie>\n')
+		
 		with open(nfo_path, 'w', encoding='utf-8') as f:
-			f.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
-			f.write('<movie>\n')
-			if 'title' in metadata and metadata['title']:
-				f.write(f"  <title>{metadata['title']}</title>\n")
-			if 'URL' in metadata and metadata['URL']:
-				f.write(f"  <url>{metadata['URL']}</url>\n")
-			if 'date' in metadata and metadata['date']:
-				f.write(f"  <premiered>{metadata['date']}</premiered>\n")
-			if 'Code' in metadata and metadata['Code']:
-				f.write(f"  <uniqueid>{metadata['Code']}</uniqueid>\n")
-			if 'tags' in metadata and metadata['tags']:
-				for tag in metadata['tags']:
-					f.write(f"  <tag>{tag}</tag>\n")
-			if 'actors' in metadata and metadata['actors']:
-				for i, performer in enumerate(metadata['actors'], 1):
-					f.write(f"  <actor>\n    <name>{performer}</name>\n    <order>{i}</order>\n  </actor>\n")
-			if 'Image' in metadata and metadata['Image']:
-				f.write(f"  <thumb aspect=\"poster\">{metadata['Image']}</thumb>\n")
-			if 'studios' in metadata and metadata['studios']:
-				for studio in metadata['studios']:
-					f.write(f"  <studio>{studio}</studio>\n")
-			elif 'studio' in metadata and metadata['studio']:
-				f.write(f"  <studio>{metadata['studio']}</studio>\n")
-			if 'description' in metadata and metadata['description']:
-				f.write(f"  <plot>{metadata['description']}</plot>\n")
-			f.write('</movie>\n')
+			f.write(''.join(parts))
 
 		# Log success
 		logger.success(f"{'Replaced' if os.path.exists(nfo_path) else 'Generated'} NFO at {nfo_path}")
@@ -2023,7 +2810,8 @@ def generate_nfo(destination_path, metadata, overwrite=False):
 def download_video(video_url, destination_path, site_config, general_config, headers=None, metadata=None, overwrite=False):
 	"""Download a video file to a temporary or final path."""
 	download_method = site_config.get('download', {}).get('method', 'curl')
-	origin = urllib.parse.urlparse(video_url).scheme + "://" + urllib.parse.urlparse(video_url).netloc
+	parsed_video_url = cached_urlparse(video_url)
+	origin = parsed_video_url.scheme + "://" + parsed_video_url.netloc
 	
 	if os.path.exists(destination_path) and not overwrite:
 		video_info = get_video_metadata(destination_path)
@@ -2046,6 +2834,15 @@ def download_video(video_url, destination_path, site_config, general_config, hea
 	return success
 
 
+def move_file(source_path, final_path):
+	"""Rename into place (a metadata-only operation), copying only when crossing filesystems."""
+	try:
+		os.replace(source_path, final_path)
+	except OSError as e:
+		if e.errno != errno.EXDEV:
+			raise
+		shutil.move(source_path, final_path)
+
 def manage_file(destination_path, destination_config, overwrite=False, video_url=None, state_set=None):
 	"""Move or upload the video (and NFO) to the final destination."""
 	success = False
@@ -2056,15 +2853,16 @@ def manage_file(destination_path, destination_config, overwrite=False, video_url
 		if not overwrite and file_exists_on_smb(destination_config, smb_path):
 			logger.info(f"File exists on SMB at {smb_path}. Skipping upload.")
 			success = True
-		else:
-			upload_to_smb(destination_path, smb_path, destination_config, overwrite)
+		elif upload_to_smb(destination_path, smb_path, destination_config, overwrite):
+			# Only discard the local copy once the upload has landed
 			os.remove(destination_path)
 			temp_nfo_path = f"{destination_path.rsplit('.', 1)[0]}.nfo"
-			if os.path.exists(temp_nfo_path):
-				upload_to_smb(temp_nfo_path, smb_nfo_path, destination_config, overwrite)
+			if os.path.exists(temp_nfo_path) and upload_to_smb(temp_nfo_path, smb_nfo_path, destination_config, overwrite):
 				os.remove(temp_nfo_path)
 			logger.success(f"Uploaded to SMB: {smb_path}")
 			success = True
+		else:
+			logger.error(f"Upload to SMB failed; keeping local copy at {destination_path}")
 	else:
 		final_path = os.path.join(destination_config['path'], os.path.basename(destination_path))
 		os.makedirs(os.path.dirname(final_path), exist_ok=True)
@@ -2072,7 +2870,7 @@ def manage_file(destination_path, destination_config, overwrite=False, video_url
 			logger.info(f"File exists locally at {final_path}. Skipping move.")
 			success = True
 		else:
-			shutil.move(destination_path, final_path)
+			move_file(destination_path, final_path)
 			apply_permissions(final_path, destination_config)
 			logger.success(f"Moved to local destination: {final_path}")
 			success = True
@@ -2081,21 +2879,39 @@ def manage_file(destination_path, destination_config, overwrite=False, video_url
 
 def cleanup(general_config):
 	"""Clean up resources like Selenium driver."""
+	# Stop the workers and wait for them before closing anything they might still be using
+	stop_event.set()
+	if general_config.get('video_pool'):
+		general_config['video_pool'].shutdown(wait=True, cancel_futures=True)
 	if 'selenium_driver' in general_config and general_config['selenium_driver']:
 		try:
 			general_config['selenium_driver'].quit()
 			logger.info("Selenium driver closed.")
 		except Exception as e:
 			logger.warning(f"Failed to close Selenium driver: {e}")
+	close_state()
+	close_smb_connections()
+	save_ffprobe_cache()
 	print()
 
 
+@functools.lru_cache(maxsize=None)
 def get_terminal_width():
+	"""Terminal width, measured once and re-measured only after a resize; 80 when stdout is not a terminal."""
 	try:
 		return os.get_terminal_size().columns
 	except OSError:
 		return 80
 
+if hasattr(signal, 'SIGWINCH'):
+	# Drop the cached width when the terminal is resized (POSIX only)
+	signal.signal(signal.SIGWINCH, lambda signum, frame: get_terminal_width.cache_clear())
+
+
+def colorize(text, color):
+	"""Wrap text in ANSI color codes only when stdout is a terminal, keeping piped logs clean."""
+	return colored(text, color) if USE_COLOR else text
+
 
 def generate_adaptive_gradient(num_lines):
 	"""Generate subtle red/purple/pink gradients with HSV fixes."""
@@ -2152,75 +2968,48 @@ def color_distance(color1, color2):
 	return 0.6 * hue_dist + 0.2 * sat_dist + 0.2 * val_dist
 	
 def hsv_to_rgb(h, s, v):
-	"""Convert HSV color to RGB color."""
-	if s == 0.0:
-		return int(v * 255), int(v * 255), int(v * 255)
-	
-	i = int(h * 6)
-	f = (h * 6) - i
-	p = v * (1 - s)
-	q = v * (1 - s * f)
-	t = v * (1 - s * (1 - f))
-	
-	i %= 6
-	
-	if i == 0:
-		r, g, b = v, t, p
-	elif i == 1:
-		r, g, b = q, v, p
-	elif i == 2:
-		r, g, b = p, v, t
-	elif i == 3:
-		r, g, b = p, q, v
-	elif i == 4:
-		r, g, b = t, p, v
-	else:
-		r, g, b = v, p, q
-	
+	"""Convert HSV color (all components 0-1) to 0-255 RGB via colorsys."""
+	r, g, b = colorsys.hsv_to_rgb(h, s, v)
 	return int(r * 255), int(g * 255), int(b * 255)
 
 def rgb_to_hsv(r, g, b):
-	"""Convert RGB color to HSV color."""
-	r, g, b = r/255.0, g/255.0, b/255.0
-	mx = max(r, g, b)
-	mn = min(r, g, b)
-	df = mx - mn
-	
-	if mx == mn:
-		h = 0
-	elif mx == r:
-		h = (60 * ((g-b)/df) + 360) % 360
-	elif mx == g:
-		h = (60 * ((b-r)/df) + 120) % 360
-	elif mx == b:
-		h = (60 * ((r-g)/df) + 240) % 360
-		
-	s = 0 if mx == 0 else df/mx
-	v = mx
-	
-	return h, s, v
+	"""Convert 0-255 RGB color to HSV with hue in degrees, via colorsys."""
+	h, s, v = colorsys.rgb_to_hsv(r / 255.0, g / 255.0, b / 255.0)
+	return h * 360, s, v
 
-def interpolate_color(start_rgb, end_rgb, steps, current_step):
-	"""Interpolate between two RGB colors."""
-	r = start_rgb[0] + (end_rgb[0] - start_rgb[0]) * current_step / (steps - 1) if steps > 1 else start_rgb[0]
-	g = start_rgb[1] + (end_rgb[1] - start_rgb[1]) * current_step / (steps - 1) if steps > 1 else start_rgb[1]
-	b = start_rgb[2] + (end_rgb[2] - start_rgb[2]) * current_step / (steps - 1) if steps > 1 else start_rgb[2]
-	return int(r), int(g), int(b)
-	
 
 
-def render_ascii(input_text, general_config, term_width, font=None):
-	"""Render ASCII art for the given input text using the art library with a specified or random font and gradient.
+@functools.lru_cache(maxsize=256)
+def render_font_lines(input_text, font):
+	"""Render text with an art font into non-blank, right-stripped lines; cached since fonts are re-measured per banner."""
+	art_text = art.text2art(input_text, font=font).replace("\t", "    ")
+	return tuple(line.rstrip() for line in art_text.splitlines() if line.strip())
 
-	Args:
-		input_text (str): The text to render as ASCII art.
-		general_config (dict): Configuration dictionary containing a list of fonts.
-		term_width (int): The width of the terminal in characters.
-		font (str, optional): Specific font to use. If None, a random font is selected from the config.
+@functools.lru_cache(maxsize=512)
+def measure_font_width(input_text, font):
+	"""Widest rendered line of text in an art font, or None if the font fails or renders nothing; cached per (text, font)."""
+	try:
+		lines = render_font_lines(input_text, font)
+	except Exception as e:
+		logger.debug(f"Font '{font}' rendering failed: {e}, skipping.")
+		return None
+	return max(len(line) for line in lines) if lines else None
 
-	Returns:
-		bool: True if rendering succeeded, False otherwise.
-	"""
+@functools.lru_cache(maxsize=None)
+def font_char_width(font):
+	"""Per-character width of an art font, measured once per process against FONT_WIDTH_PROBE."""
+	# Rendered directly so probe output never evicts real banner renders from render_font_lines
+	try:
+		art_text = art.text2art(FONT_WIDTH_PROBE, font=font).replace("\t", "    ")
+	except Exception as e:
+		logger.debug(f"Font '{font}' rendering failed: {e}, skipping.")
+		return None
+	probe_width = max((len(line.rstrip()) for line in art_text.splitlines()), default=0)
+	return probe_width / len(FONT_WIDTH_PROBE) if probe_width else None
+
+@functools.lru_cache(maxsize=64)
+def build_ascii_frame(input_text, term_width, fonts, font=None):
+	"""Pick a font for the text and return its trimmed, padded, centered lines, or None if rendering fails."""
 	# Calculate max width (90% of terminal width)
 	max_width = int(term_width * 0.9)
 	logger.debug(f"Terminal width: {term_width}, Max width (90%): {max_width}")
@@ -2229,46 +3018,48 @@ def render_ascii(input_text, general_config, term_width, font=None):
 	selected_font = None
 	art_width = None
 	if font:
-		try:
-			# Test if the font is valid by rendering the text
-			art_text = art.text2art(input_text, font=font)
-			art_text = art_text.replace("\t", "    ")
-			lines = [line.rstrip() for line in art_text.splitlines() if line.strip()]
-			if lines:
-				max_line_width = max(len(line) for line in lines)
-				# logger.debug(f"Specified font '{font}': Unbounded width = {max_line_width}")
-				if max_line_width <= max_width:
-					selected_font = font
-					art_width = max_line_width
-					logger.debug(f"Specified font '{font}' fits within max_width {max_width}. Using it.")
-				else:
-					logger.debug(f"Specified font '{font}' width {max_line_width} exceeds max_width {max_width}. Falling back to random selection.")
-			else:
-				logger.debug(f"Specified font '{font}': No valid lines rendered. Falling back to random selection.")
-		except Exception as e:
-			logger.debug(f"Specified font '{font}' rendering failed: {e}. Falling back to random selection.")
+		# Test if the font is valid by measuring its rendering of the text
+		max_line_width = measure_font_width(input_text, font)
+		if max_line_width is None:
+			logger.debug(f"Specified font '{font}': No valid lines rendered. Falling back to random selection.")
+		elif max_line_width <= max_width:
+			selected_font = font
+			art_width = max_line_width
+			logger.debug(f"Specified font '{font}' fits within max_width {max_width}. Using it.")
+		else:
+			logger.debug(f"Specified font '{font}' width {max_line_width} exceeds max_width {max_width}. Falling back to random selection.")
 
 	# If no valid font was specified or the specified font doesn't fit, select a random font
 	if not selected_font:
-		fonts = general_config.get("fonts", [])
 		if not fonts:
 			logger.warning("No fonts specified in general_config['fonts']. Falling back to default.")
 			fonts = ["standard"]
 
-		# Sample all fonts to get their unbounded width
+		# Rank fonts by estimated width and render only until the widest real fit turns up
+		char_widths = {font: font_char_width(font) for font in fonts}
+		estimates = [(width * len(input_text), font) for font, width in char_widths.items() if width is not None]
+		# Wide terminal or short text: if even the widest estimate fits, it's the only font worth rendering
+		widest = max(estimates, default=None)
+		if widest and widest[0] <= max_width:
+			estimates = [widest]
+		else:
+			estimates.sort(reverse=True)
+		for estimate, font in estimates:
+			if estimate > max_width * 1.25:
+				continue  # Probe glyphs run wide, so allow some slack before giving up on a font unrendered
+			max_line_width = measure_font_width(input_text, font)
+			if max_line_width is not None and max_line_width <= max_width:
+				selected_font, art_width = font, max_line_width
+				logger.debug(f"Selected largest qualifying font: '{selected_font}' with width {art_width}")
+				break
+
+	if not selected_font:
+		# Estimates found no fit: sample every font to get their unbounded width
 		font_widths = {}
 		for font in fonts:
-			try:
-				art_text = art.text2art(input_text, font=font)
-				art_text = art_text.replace("\t", "    ")
-				lines = [line.rstrip() for line in art_text.splitlines() if line.strip()]
-				if lines:
-					max_line_width = max(len(line) for line in lines)
-					font_widths[font] = max_line_width
-					# logger.debug(f"Font '{font}': Unbounded width = {max_line_width}")
-			except Exception as e:
-				logger.debug(f"Font '{font}' rendering failed: {e}, skipping.")
-				continue
+			max_line_width = measure_font_width(input_text, font)
+			if max_line_width is not None:
+				font_widths[font] = max_line_width
 
 		if not font_widths:
 			# logger.warning("No valid fonts found. Using fallback.")
@@ -2290,50 +3081,73 @@ def render_ascii(input_text, general_config, term_width, font=None):
 				selected_font, art_width = sorted_fonts[0]
 				logger.debug(f"Selected largest qualifying font: '{selected_font}' with width {art_width}")
 
-	# Render final art with the selected font
+	# Final art for the selected font: the render kept from measuring it, not a second text2art
 	try:
-		art_text = art.text2art(input_text, font=selected_font)
-		art_text = art_text.replace("\t", "    ")
-		lines = [line.rstrip() for line in art_text.splitlines() if line.strip()]
+		lines = render_font_lines(input_text, selected_font)
 		# logger.debug(f"Raw lines before trimming: {[line for line in lines]}")
 	except Exception as e:
 		logger.error(f"Failed to render ASCII art with font '{selected_font}': {e}")
-		return False
+		return None
 	
-	# Trim each line to max_width
-	final_lines = []
-	for line in lines:
-		line_width = len(line)
-		if line_width > max_width:
-			# logger.debug(f"Line '{line}' width {line_width} exceeds max_width {max_width}. Trimming.")
-			final_lines.append(line[:max_width])
-		else:
-			final_lines.append(line)
-		#logger.debug(f"Line width after trimming: {len(final_lines[-1])}, Line: '{final_lines[-1]}'")
-	art_width = max(len(line) for line in final_lines) if final_lines else len(input_text)
+	# Width after trimming each line to max_width, taken from the cached measurement instead of another pass
+	measured_width = measure_font_width(input_text, selected_font)
+	art_width = min(measured_width, max_width) if measured_width else len(input_text)
 	logger.debug(f"Adjusted art_width: {art_width}")
 
-	# Pad lines to art_width for consistent centering
-	final_lines = [line.ljust(art_width) for line in final_lines]
-
-	# Center the art
+	# Trim, pad to art_width for consistent centering, and center in a single pass
 	left_padding = (term_width - art_width) // 2 if art_width < term_width else 0
-	centered_lines = [" " * left_padding + line for line in final_lines]
+	pad = " " * left_padding
+	centered_lines = tuple(pad + line[:max_width].ljust(art_width) for line in lines)
 	logger.debug(f"Art centered with padding: {left_padding}, Total lines: {len(centered_lines)}, Final width: {art_width}")
+	return centered_lines
+
+def prime_font_widths(fonts):
+	"""Measure every font's per-character width up front so the first banner only ranks cached numbers."""
+	for font in fonts:
+		font_char_width(font)
+
+def render_ascii(input_text, general_config, term_width, font=None):
+	"""Render ASCII art for the given input text using the art library with a specified or random font and gradient.
+
+	Args:
+		input_text (str): The text to render as ASCII art.
+		general_config (dict): Configuration dictionary containing a list of fonts.
+		term_width (int): The width of the terminal in characters.
+		font (str, optional): Specific font to use. If None, a random font is selected from the config.
+
+	Returns:
+		bool: True if rendering succeeded, False otherwise.
+	"""
+	# Font choice and layout are deterministic per input, so repeat banners skip straight to coloring
+	centered_lines = build_ascii_frame(input_text, term_width, tuple(general_config.get("fonts", [])), font)
+	if centered_lines is None:
+		return False
 
 	# Apply adaptive gradient
 	start_rgb, end_rgb = generate_adaptive_gradient(len(centered_lines))
 	logger.debug(f"start_rgb: {start_rgb}, end_rgb: {end_rgb}")
 	steps = len(centered_lines)
-
-	for i, line in enumerate(centered_lines):
-		if steps > 1:
-			rgb = interpolate_color(start_rgb, end_rgb, steps, i)
-		else:
-			rgb = start_rgb
-		style = Style(color=f"rgb({rgb[0]},{rgb[1]},{rgb[2]})", bold=True)
-		text = Text(line, style=style)
-		console.print(text, justify="left", overflow="crop", no_wrap=True)
+	if steps > 1:
+		# Linear interpolation between the gradient ends, with the per-channel deltas worked out once
+		r0, g0, b0 = start_rgb
+		dr, dg, db = end_rgb[0] - r0, end_rgb[1] - g0, end_rgb[2] - b0
+		last = steps - 1
+		rgbs = [(int(r0 + dr * i / last), int(g0 + dg * i / last), int(b0 + db * i / last)) for i in range(steps)]
+	else:
+		rgbs = [start_rgb] * steps
+
+	# Neighbouring lines of short banners often land on the same color; build each Style once
+	style_cache = {}
+	banner = Text()
+	for i, (line, rgb) in enumerate(zip(centered_lines, rgbs)):
+		style = style_cache.get(rgb)
+		if style is None:
+			style = style_cache[rgb] = Style(color=f"rgb({rgb[0]},{rgb[1]},{rgb[2]})", bold=True)
+		if i:
+			banner.append("\n")
+		banner.append(line, style=style)
+	# One print for the whole banner instead of a render pass and write per line
+	console.print(banner, justify="left", overflow="crop", no_wrap=True)
 
 	return True
 
@@ -2351,26 +3165,29 @@ def display_options():
 def display_global_examples():
 	console.print("[yellow][bold]examples[/bold] (generated from ./sites/):[/yellow]")
 	
-	# Collect all site/mode/example combos
-	all_examples = []
-	for site_config_file in os.listdir(SITE_DIR):
-		if site_config_file.endswith(".yaml"):
-			try:
-				with open(os.path.join(SITE_DIR, site_config_file), 'r') as f:
-					site_config = yaml.safe_load(f)
-				site_name = site_config.get("name", "Unknown")
-				shortcode = site_config.get("shortcode", "??")
-				modes = site_config.get("modes", {})
-				for mode, config in modes.items():
-					tip = config.get("tip", "No description available")
-					examples = config.get("examples", ["N/A"])
-					for example in examples:
-						all_examples.append((site_name, shortcode, mode, tip, example))
-			except Exception as e:
-				logger.warning(f"Failed to load config '{site_config_file}': {e}")
-	
-	# Randomly select up to 10 examples
-	selected_examples = random.sample(all_examples, min(10, len(all_examples))) if all_examples else []
+	# Randomly select up to 10 site/mode/example combos with reservoir sampling, never holding them all
+	selected_examples = []
+	seen = 0
+	# Parsed configs come from the shared mtime-keyed cache, so usage output and the query reuse one parse
+	for site_config_file, site_config in load_site_configs():
+		try:
+			site_name = site_config.get("name", "Unknown")
+			shortcode = site_config.get("shortcode", "??")
+			modes = site_config.get("modes", {})
+			for mode, config in modes.items():
+				tip = config.get("tip", "No description available")
+				examples = config.get("examples", ["N/A"])
+				for example in examples:
+					if len(selected_examples) < 10:
+						selected_examples.append((site_name, shortcode, mode, tip, example))
+					else:
+						slot = random.randrange(seen + 1)
+						if slot < 10:
+							selected_examples[slot] = (site_name, shortcode, mode, tip, example)
+					seen += 1
+		except Exception as e:
+			logger.warning(f"Failed to load config '{site_config_file}': {e}")
+	random.shuffle(selected_examples)  # Reservoir keeps scan order; sample() used to return random order
 	
 	# Display in a borderless table
 	table = Table(show_edge=False, expand=True, show_lines=False, show_header=True)
@@ -2378,15 +3195,15 @@ def display_global_examples():
 	table.add_column("[yellow]action[/yellow]", justify="left")
 	
 	for site_name, shortcode, mode, tip, example in selected_examples:
-		cmd = f"[red]scrape[/red] [magenta]{shortcode}[/magenta] [yellow]{mode}[/yellow] [blue]\"{example}\"[/blue]"
-		effect = f"{tip} [blue]\"{example}\"[/blue] on [magenta]{site_name}[/magenta]"
+		cmd = EXAMPLE_CMD_TEMPLATE.format(shortcode, mode, example)
+		effect = EXAMPLE_EFFECT_TEMPLATE.format(tip, example, site_name)
 		table.add_row(cmd, effect)
 	
 	console.print(table)
 	console.print()
 
 
-def display_site_details(site_config, term_width):
+def display_site_details(site_config, term_width, general_config):
 	"""Display a detailed readout for a specific site config with domain-based ASCII art."""
 	site_name = site_config.get("name", "Unknown")
 	shortcode = site_config.get("shortcode", "??")
@@ -2400,7 +3217,6 @@ def display_site_details(site_config, term_width):
 	metadata = has_metadata_selectors(site_config, return_fields=True)
 	site_note = site_config.get("note", None)
 	
-	general_config = load_configuration('general')
 	console.print()
 	render_ascii(domain, general_config, term_width)
 	console.print()
@@ -2433,9 +3249,11 @@ def display_site_details(site_config, term_width):
 	if modes:
 		console.print("[yellow][bold]supported modes:[/bold][/yellow]")
 		mode_table = Table(show_edge=True, expand=True, width=term_width)
+		function_width = (term_width // 10) * 4
+		example_width = term_width // 2
 		mode_table.add_column("[bold]mode[/bold]", width=15)
-		mode_table.add_column("[bold]function[/bold]", width=(term_width//10)*4)
-		mode_table.add_column("[bold]example[/bold]", width=term_width//2)
+		mode_table.add_column("[bold]function[/bold]", width=function_width)
+		mode_table.add_column("[bold]example[/bold]", width=example_width)
 		
 		has_pagination_footnote = False
 		has_encoding_footnote = False
@@ -2447,7 +3265,7 @@ def display_site_details(site_config, term_width):
 			# Check for footnotes per mode
 			supports_pagination = "url_pattern_pages" in config
 			mode_url_rules = config.get("url_encoding_rules", {})
-			has_special_encoding = " & " in mode_url_rules or "&" in mode_url_rules
+			has_special_encoding = not AMP_ENCODING_KEYS.isdisjoint(mode_url_rules)
 			footnotes = []
 			if supports_pagination:
 				footnotes.append("⸸")
@@ -2476,57 +3294,60 @@ def display_site_details(site_config, term_width):
 
 def generate_global_table(term_width, output_path=None):
 	"""Generate the global sites table, optionally saving as Markdown to output_path."""
+	list_width = (term_width - 8) // 3  # Shared by the modes and metadata columns
 	table = Table(show_edge=True, expand=True, width=term_width)
 	table.add_column("[bold][magenta]code[/magenta][/bold]", width=6, justify="left")
 	table.add_column("[bold][magenta]site[/magenta][/bold]", width=12, justify="left")
-	table.add_column("[bold][yellow]modes[/yellow][/bold]", width=(term_width-8)//3)
-	table.add_column("[bold][green]metadata[/green][/bold]", width=(term_width-8)//3)
+	table.add_column("[bold][yellow]modes[/yellow][/bold]", width=list_width)
+	table.add_column("[bold][green]metadata[/green][/bold]", width=list_width)
 	
 	supported_sites = []
 	selenium_sites = set()
 	encoding_rule_sites = set()
 	pagination_modes = set()
 	
-	for site_config_file in os.listdir(SITE_DIR):
-		if site_config_file.endswith(".yaml"):
-			try:
-				with open(os.path.join(SITE_DIR, site_config_file), 'r') as f:
-					site_config = yaml.safe_load(f)
-				site_name = site_config.get("name", "Unknown")
-				site_code = site_config.get("shortcode", "??")
-				use_selenium = site_config.get("use_selenium", False)
-				
-				if use_selenium:
-					selenium_sites.add(site_code)
-				
-				modes = site_config.get("modes", {})
-				modes_display_list = []
-				for mode, config in modes.items():
-					supports_pagination = "url_pattern_pages" in config
-					mode_url_rules = config.get("url_encoding_rules", {})
-					has_special_encoding = " & " in mode_url_rules or "&" in mode_url_rules
-					footnotes = []
-					if supports_pagination:
-						footnotes.append("⸸")
-						pagination_modes.add(mode)
-					if has_special_encoding:
-						footnotes.append("‡")
-						if site_code not in encoding_rule_sites:
-							encoding_rule_sites.add(site_code)
-					mode_display = f"[yellow][bold]{mode}[/bold][/yellow]" + (f" {''.join(footnotes)}" if footnotes else "")
-					modes_display_list.append(mode_display)
-				
-				metadata = has_metadata_selectors(site_config, return_fields=True)
-				supported_sites.append((site_code, site_name, modes_display_list, metadata, use_selenium))
-			except Exception as e:
-				logger.warning(f"Failed to load config '{site_config_file}': {e}")
+	for site_config_file, site_config in load_site_configs():
+		try:
+			site_name = site_config.get("name", "Unknown")
+			site_code = site_config.get("shortcode", "??")
+			use_selenium = site_config.get("use_selenium", False)
+			
+			if use_selenium:
+				selenium_sites.add(site_code)
+			
+			modes = site_config.get("modes", {})
+			modes_display_list = []
+			modes_plain_list = []  # Same labels without Rich markup, for the Markdown table
+			for mode, config in modes.items():
+				supports_pagination = "url_pattern_pages" in config
+				mode_url_rules = config.get("url_encoding_rules", {})
+				has_special_encoding = not AMP_ENCODING_KEYS.isdisjoint(mode_url_rules)
+				footnotes = []
+				if supports_pagination:
+					footnotes.append("⸸")
+					pagination_modes.add(mode)
+				if has_special_encoding:
+					footnotes.append("‡")
+					if site_code not in encoding_rule_sites:
+						encoding_rule_sites.add(site_code)
+				footnote_suffix = f" {''.join(footnotes)}" if footnotes else ""
+				modes_display_list.append(f"[yellow][bold]{mode}[/bold][/yellow]{footnote_suffix}")
+				modes_plain_list.append(f"{mode}{footnote_suffix}")
+			
+			metadata = has_metadata_selectors(site_config, return_fields=True)
+			supported_sites.append((site_code, site_name, modes_display_list, modes_plain_list, metadata, use_selenium))
+		except Exception as e:
+			logger.warning(f"Failed to load config '{site_config_file}': {e}")
 	
+	# Sorted once for both the Rich table and the Markdown output
+	supported_sites.sort(key=lambda x: x[0])
 	if supported_sites:
-		for site_code, site_name, modes_display_list, metadata, use_selenium in sorted(supported_sites, key=lambda x: x[0]):
-			code_display = f"[magenta][bold]{site_code}[/bold][/magenta]"
-			site_display = f"[magenta]{site_name}[/magenta]" + (f" †" if use_selenium else "")
+		for site_code, site_name, modes_display_list, _, metadata, use_selenium in supported_sites:
+			code_display = SITE_CODE_TEMPLATE.format(site_code)
+			site_display = SITE_NAME_TEMPLATE.format(site_name) + (" †" if use_selenium else "")
 			modes_display = " · ".join(modes_display_list) if modes_display_list else "[gray]None[/gray]"
-			metadata_display = " · ".join(f"[green][bold]{field}[/bold][/green]" for field in metadata) if metadata else "None"
+			# Markup lives in the separator, so the join builds the whole cell without a string per field
+			metadata_display = f"[green][bold]{METADATA_FIELD_SEPARATOR.join(metadata)}[/bold][/green]" if metadata else "None"
 			table.add_row(code_display, site_display, modes_display, metadata_display)
 	else:
 		logger.warning("No valid site configs found in 'configs' folder.")
@@ -2547,14 +3368,10 @@ def generate_global_table(term_width, output_path=None):
 			"| ------ | ----------------------------- | ------------------------------ | ------------------------------ |\n"
 		]
 		
-		for site_code, site_name, modes_display_list, metadata, use_selenium in sorted(supported_sites, key=lambda x: x[0]):
+		for site_code, site_name, _, modes_plain_list, metadata, use_selenium in supported_sites:
 			code_str = f"`{site_code}`"
 			site_str = f"**_{site_name}_**" + (f" †" if use_selenium else "")
-			# Strip Rich formatting and keep only mode name + footnotes
-			modes_str = " · ".join(
-				mode.replace("[yellow][bold]", "").replace("[/bold][/yellow]", "") 
-				for mode in modes_display_list
-			) if modes_display_list else "None"
+			modes_str = " · ".join(modes_plain_list) if modes_plain_list else "None"
 			metadata_str = " · ".join(metadata) if metadata else "None"
 			md_lines.append(f"| {code_str:<6} | {site_str:<29} | {modes_str:<30} | {metadata_str:<30} |\n")
 		
@@ -2567,7 +3384,7 @@ def generate_global_table(term_width, output_path=None):
 		
 		try:
 			with open(output_path, 'w', encoding='utf-8') as f:
-				f.writelines(md_lines)
+				f.write("".join(md_lines))  # One write for the whole table rather than one per buffered line
 			logger.info(f"Saved site table to '{output_path}' in Markdown format.")
 		except Exception as e:
 			logger.error(f"Failed to write Markdown table to '{output_path}': {e}")
@@ -2608,7 +3425,7 @@ def handle_single_arg(arg, general_config, args, term_width, state_set):
 				console.print()
 				process_url(arg, config, general_config, args.overwrite, args.re_nfo, args.page, apply_state=args.applystate, state_set=state_set)
 		else:
-			display_site_details(config, term_width)
+			display_site_details(config, term_width, general_config)
 			sys.exit(0)
 	else:
 		if is_url_flag:
@@ -2651,11 +3468,10 @@ def handle_multi_arg(args, general_config, args_obj, state_set):
 			site_config['base_url'],
 			mode_config['url_pattern'],
 			site_config,
-			mode=mode
+			mode=mode,
 			sort=args_obj.sort,  # Pass the sort argument
 			min_duration=args_obj.min_duration,  # Pass the min_duration argument
 			**{mode: identifier, 'page': page_num if page_num > 1 else None}
-)
 		)
 	else:
 		url = construct_url(
@@ -2673,7 +3489,9 @@ def handle_multi_arg(args, general_config, args_obj, state_set):
 		process_rss_feed(url, site_config, general_config, args_obj.overwrite, general_config.get('headers', {}), args_obj.re_nfo, apply_state=args_obj.applystate, state_set=state_set)
 	else:
 		current_page_num = page_num
+		page_limiter = get_page_limiter(general_config)
 		while url:
+			page_limiter.acquire()
 			next_page, new_page_number, _ = process_list_page(
 				url, site_config, general_config, current_page_num, video_offset, mode, identifier,
 				args_obj.overwrite, general_config.get('headers', {}), args_obj.re_nfo, apply_state=args_obj.applystate, state_set=state_set
@@ -2681,8 +3499,16 @@ def handle_multi_arg(args, general_config, args_obj, state_set):
 			url = next_page
 			current_page_num = new_page_number
 			video_offset = 0  # Reset offset after first page
-			state_set = load_state()
-			time.sleep(general_config['sleep']['between_pages'])
+			# state_set is kept current by record_processed_url, so there is no .state reload between pages
+
+
+def only_debug_records(record):
+	"""Loguru filter for the debug sink."""
+	return record["level"].name == "DEBUG"
+
+def skip_debug_records(record):
+	"""Loguru filter for the main sink, which leaves DEBUG to the debug sink."""
+	return record["level"].name != "DEBUG"
 
 
 def main():
@@ -2712,14 +3538,14 @@ def main():
 			level="DEBUG",
 			format="<d>{time:YYYYMMDDHHmmss.SSS}</d> | <d>{level:1.1}</d> | <d>{function}:{line}</d> · <d>{message}</d>",
 			colorize=True,
-			filter=lambda record: record["level"].name == "DEBUG"
+			filter=only_debug_records
 		)
 	logger.add(
 		sys.stderr,
 		level="INFO",
 		format="<d>{time:YYYYMMDDHHmmss.SSS}</d> | <level>{level:1.1}</level> | <d>{function}:{line}</d> · <level>{message}</level>",
 		colorize=True,
-		filter=lambda record: record["level"].name != "DEBUG"
+		filter=skip_debug_records
 	)
 	
 	general_config = load_configuration('general')
@@ -2727,10 +3553,15 @@ def main():
 		logger.error("Failed to load general configuration. Please check 'config/general.yml'.")
 		sys.exit(1)
 	
+	# Font probes run alongside the state load instead of ahead of the first banner
+	font_primer = threading.Thread(target=prime_font_widths, args=(general_config.get("fonts") or ["standard"],), daemon=True)
+	font_primer.start()
+	
 	# Load state once at startup
 	state_set = load_state()
 	logger.debug(f"Loaded {len(state_set)} URLs from state file")
 	
+	font_primer.join()
 	print()
 	render_ascii("Smutscrape", general_config, term_width)
 	
@@ -2767,8 +3598,8 @@ def main():
 		cleanup(general_config)
 		sys.exit(1)
 	finally:
+		cleanup(general_config)  # Waits for in-flight workers, so the VPN stays up until their traffic is done
 		handle_vpn(general_config, 'stop')
-		cleanup(general_config)
 		logger.info("Scraping session completed.")
 
 if __name__ == "__main__":
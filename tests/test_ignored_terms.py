@@ -0,0 +1,36 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+	import scrape
+except ImportError as e:  # scrape.py pulls in its full runtime dependency set at import
+	raise unittest.SkipTest(f"scrape dependencies unavailable: {e}")
+
+
+class ShouldIgnoreVideoTests(unittest.TestCase):
+	"""Matches found case-insensitively must map back to their configured term without a KeyError."""
+
+	def test_case_folded_matches_report_configured_term(self):
+		cases = [
+			(['step sister'], 'ſtep sister'),
+			(['kiss'], 'KİSS'),
+			(['kiss'], 'kıss'),
+			(['city'], 'CİTY'),
+		]
+		for ignored_terms, title in cases:
+			with self.subTest(title=title):
+				self.assertTrue(scrape.should_ignore_video({'title': title}, ignored_terms))
+
+	def test_list_values_and_hyphenated_variants(self):
+		self.assertTrue(scrape.should_ignore_video({'tags': ['Other', 'STEP-SISTER']}, ['step sister']))
+		self.assertTrue(scrape.should_ignore_video({'tags': ['ſtep-sister']}, ['step sister']))
+
+	def test_unrelated_titles_pass(self):
+		self.assertFalse(scrape.should_ignore_video({'title': 'Kissimmee city tour'}, ['kiss', 'cities']))
+
+
+if __name__ == '__main__':
+	unittest.main()